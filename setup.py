@@ -20,6 +20,8 @@ setup(
     license=_license,
     packages=find_packages(),
     include_package_data=True,
+    # Faster whole-array natives
+    extras_require={"numpy": ["numpy"]},
     entry_points={
         "console_scripts": [
             "tinylox=tinylox.tinylox:main",
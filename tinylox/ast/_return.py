@@ -1,16 +1,15 @@
 """return module"""
 
-from typing import Any
+from enum import Enum
 
 
-class Return(RuntimeError):
+class Completion(Enum):
     """
-    Return exception
+    Abrupt completion of a statement, statements completing
+    normally return `None` so loops and blocks only check for it
     """
 
-    def __init__(self, value: Any):
-        self.__value = value
-
-    @property
-    def value(self) -> Any:
-        return self.__value
+    # The returned value is stored on the interpreter
+    RETURN = "return"
+    # The called function and its frame are stored on the interpreter
+    TAIL_CALL = "tail_call"
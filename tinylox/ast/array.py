@@ -0,0 +1,164 @@
+"""array native module"""
+
+from array import array
+from itertools import accumulate
+from operator import add as add_values, mul
+from typing import Any, Iterable
+
+from .native import NativeFunction, check_index, register_type
+from ..error.error import NativeError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class LoxArray:
+    """
+    Fixed size array of numbers, backed by a NumPy array
+    when NumPy is installed and by `array('d')` otherwise
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Iterable[float]):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __str__(self) -> str:
+        return "[" + ", ".join(str(float(value)) for value in self.values) + "]"
+
+
+def check_array(value: Any) -> LoxArray:
+    """
+    Check if a value is an array
+    """
+
+    if type(value) is not LoxArray:
+        raise NativeError("Operand must be an array")
+
+    return value
+
+
+register_type("array", check_array)
+
+
+def check_same_length(a: LoxArray, b: LoxArray):
+    """
+    Check if two arrays can be combined element by element
+    """
+
+    if len(a) != len(b):
+        raise NativeError("Arrays must have the same length")
+
+
+def create(size: float) -> LoxArray:
+    size = check_index(size, float("inf"))
+
+    if numpy is not None:
+        return LoxArray(numpy.zeros(size))
+
+    return LoxArray(array("d", bytes(size * 8)))
+
+
+def create_range(size: float) -> LoxArray:
+    size = check_index(size, float("inf"))
+
+    if numpy is not None:
+        return LoxArray(numpy.arange(size, dtype=float))
+
+    return LoxArray(array("d", range(size)))
+
+
+def get(a: LoxArray, index: float) -> float:
+    values = a.values
+
+    # An index equal to the length is out of range
+    return float(values[check_index(index, len(values) - 1)])
+
+
+def set_value(a: LoxArray, index: float, value: float) -> float:
+    values = a.values
+
+    values[check_index(index, len(values) - 1)] = value
+
+    return value
+
+
+def length(a: LoxArray) -> float:
+    return float(len(a))
+
+
+def add(a: LoxArray, b: LoxArray) -> LoxArray:
+    check_same_length(a, b)
+
+    if numpy is not None:
+        return LoxArray(a.values + b.values)
+
+    return LoxArray(array("d", map(add_values, a.values, b.values)))
+
+
+def scale(a: LoxArray, factor: float) -> LoxArray:
+    values = a.values
+
+    if numpy is not None:
+        return LoxArray(values * factor)
+
+    return LoxArray(array("d", map(factor.__mul__, values)))
+
+
+def total(a: LoxArray) -> float:
+    values = a.values
+
+    if numpy is not None:
+        return float(numpy.sum(values))
+
+    return float(sum(values))
+
+
+def dot(a: LoxArray, b: LoxArray) -> float:
+    check_same_length(a, b)
+
+    if numpy is not None:
+        return float(numpy.dot(a.values, b.values))
+
+    return float(sum(map(mul, a.values, b.values)))
+
+
+def cumulative_sum(a: LoxArray) -> LoxArray:
+    values = a.values
+
+    if numpy is not None:
+        return LoxArray(numpy.cumsum(values))
+
+    return LoxArray(array("d", accumulate(values)))
+
+
+def slice_values(a: LoxArray, start: float, end: float) -> LoxArray:
+    values = a.values
+    end = check_index(end, len(values))
+    start = check_index(start, end)
+
+    if numpy is not None:
+        return LoxArray(values[start:end].copy())
+
+    return LoxArray(values[start:end])
+
+
+# Array natives defined in the global environment
+ARRAY_NATIVES = (
+    NativeFunction("array", create, 1, ("number",)),
+    NativeFunction("array_range", create_range, 1, ("number",)),
+    NativeFunction("array_get", get, 2, ("array", "number")),
+    NativeFunction("array_set", set_value, 3, ("array", "number", "number")),
+    NativeFunction("array_length", length, 1, ("array",)),
+    NativeFunction("array_add", add, 2, ("array", "array")),
+    NativeFunction("array_scale", scale, 2, ("array", "number")),
+    NativeFunction("array_sum", total, 1, ("array",)),
+    NativeFunction("array_dot", dot, 2, ("array", "array")),
+    NativeFunction("array_cumsum", cumulative_sum, 1, ("array",)),
+    NativeFunction("array_slice", slice_values, 3, ("array", "number", "number")),
+)
@@ -1,5 +1,6 @@
 """callable module"""
 
+from functools import cached_property
 from typing import Any, List
 
 
@@ -8,9 +9,24 @@ class LoxCallable:
     Callable expression back end
     """
 
+    # Accepts more arguments than its arity
+    variadic = False
+
     def __call__(self, interpreter: object, arguments: List[Any]) -> Any:
         raise Exception("Not implemented")
 
+    @cached_property
+    def key(self) -> Any:
+        """
+        Call sites cache how they invoke a callee by its key, the callees
+        sharing a key are invoked the same way with the same arity.
+        A callable is its own key unless it sets a shared one,
+        a Lox function is keyed by its layout so the caches keep
+        no closure alive
+        """
+
+        return self
+
     def arity(self) -> int:
         """
         Get the expected arguments amount
@@ -0,0 +1,137 @@
+"""class module"""
+
+from typing import Any, Dict, List, Self
+
+from .callable import LoxCallable
+from .function import LoxFunction
+
+
+class Shape:
+    """
+    Hidden class mapping the fields of an instance to the slots of
+    its fields list. Instances of a class given the same fields in
+    the same order share a shape, so a shape identifies both the
+    field slots and the methods of its instances
+    """
+
+    __slots__ = ("cls", "slots", "transitions")
+
+    def __init__(self, cls: "LoxClass", slots: Dict[str, int]):
+        self.cls = cls
+        self.slots = slots
+
+        # Shapes reached by adding a field
+        self.transitions: Dict[str, Shape] = {}
+
+    def add(self, name: str) -> Self:
+        """
+        Return the shape of an instance given the new field `name`
+        """
+
+        shape = self.transitions.get(name)
+
+        if shape is None:
+            shape = Shape(self.cls, {**self.slots, name: len(self.slots)})
+            self.transitions[name] = shape
+
+        return shape
+
+
+class LoxInstance:
+    """
+    Class instance, its field values are stored in the slots given
+    by its shape
+    """
+
+    __slots__ = ("shape", "fields")
+
+    def __init__(self, shape: Shape):
+        self.shape = shape
+        self.fields: List[Any] = []
+
+    def __str__(self) -> str:
+        return self.shape.cls.name + " instance"
+
+
+class BoundMethod(LoxCallable):
+    """
+    Method read from an instance, the instance takes
+    the first slot of the method frame
+    """
+
+    def __init__(self, receiver: LoxInstance, method: LoxFunction):
+        self.receiver = receiver
+        self.method = method
+        self.key = method.layout
+
+    def __call__(self, interpreter: object, arguments: List[Any]) -> Any:
+        method = self.method
+        frame = method.layout.acquire()
+        frame[0] = self.receiver
+        frame[1 : len(arguments) + 1] = arguments
+
+        token = interpreter.call_site or method.declaration.name
+
+        if method.generator:
+            return interpreter.start_generator(method, frame, token)
+
+        value = interpreter.call_function(method, frame, token)
+
+        # An initializer always returns its instance
+        if method.initializer:
+            return self.receiver
+
+        return value
+
+    def __str__(self) -> str:
+        return str(self.method)
+
+    def arity(self) -> int:
+        return self.method.layout.arity
+
+
+class LoxClass(LoxCallable):
+    """
+    Class back end, calling it makes an instance.
+    Classes can't change once declared, so the inherited methods
+    are copied into the methods of the class
+    """
+
+    def __init__(
+        self, name: str, superclass: Self | None, methods: Dict[str, LoxFunction]
+    ):
+        self.name = name
+        self.superclass = superclass
+
+        if superclass is not None:
+            methods = {**superclass.methods, **methods}
+
+        self.methods = methods
+        self.initializer = methods.get("init")
+
+        # The classes without an initializer take no argument, the other
+        # ones are keyed apart from the bound methods of their initializer
+        if self.initializer is None:
+            self.key = LoxClass
+        else:
+            self.key = (LoxClass, self.initializer.layout)
+
+        # Shape of the instances without any field
+        self.shape = Shape(self, {})
+
+    def __call__(self, interpreter: object, arguments: List[Any]) -> Any:
+        instance = LoxInstance(self.shape)
+
+        if self.initializer is not None:
+            BoundMethod(instance, self.initializer)(interpreter, arguments)
+
+        return instance
+
+    def __str__(self) -> str:
+        return self.name
+
+    def arity(self) -> int:
+        if self.initializer is None:
+            return 0
+
+        return self.initializer.layout.arity
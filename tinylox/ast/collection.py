@@ -0,0 +1,223 @@
+"""list and map natives module"""
+
+from typing import Any, Dict, List, Tuple
+
+from .native import NativeFunction, check_index, register_type
+from .operators import stringify
+from .rope import Rope
+from ..error.error import NativeError
+
+
+class LoxList:
+    """
+    Growable list of Lox values
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: List[Any] = None):
+        self.values = [] if values is None else values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __str__(self) -> str:
+        return "[" + ", ".join(map(stringify, self.values)) + "]"
+
+
+class LoxMap:
+    """
+    Hash map from Lox values to Lox values, every entry
+    holds its Lox key and its value
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self):
+        self.entries: Dict[Any, Tuple[Any, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __str__(self) -> str:
+        return (
+            "{"
+            + ", ".join(
+                stringify(key) + ": " + stringify(value)
+                for key, value in self.entries.values()
+            )
+            + "}"
+        )
+
+
+# Python keys of the booleans, `true` and `1` are the same Python key
+TRUE_KEY = object()
+FALSE_KEY = object()
+
+
+def map_key(key: Any) -> Any:
+    """
+    Return the Python key of a Lox value
+    """
+
+    kind = type(key)
+
+    if kind is bool:
+        return TRUE_KEY if key else FALSE_KEY
+
+    # A rope hashes like its string, the key is stored flattened
+    if kind is Rope:
+        return str(key)
+
+    return key
+
+
+def check_list(value: Any) -> LoxList:
+    """
+    Check if a value is a list
+    """
+
+    if type(value) is not LoxList:
+        raise NativeError("Operand must be a list")
+
+    return value
+
+
+def check_map(value: Any) -> LoxMap:
+    """
+    Check if a value is a map
+    """
+
+    if type(value) is not LoxMap:
+        raise NativeError("Operand must be a map")
+
+    return value
+
+
+register_type("list", check_list)
+register_type("map", check_map)
+
+
+def create_list() -> LoxList:
+    return LoxList()
+
+
+def list_of(*values: Any) -> LoxList:
+    return LoxList(list(values))
+
+
+def list_append(a: LoxList, value: Any) -> None:
+    a.values.append(value)
+
+
+def list_get(a: LoxList, index: float) -> Any:
+    values = a.values
+
+    return values[check_index(index, len(values) - 1)]
+
+
+def list_set(a: LoxList, index: float, value: Any) -> Any:
+    values = a.values
+
+    values[check_index(index, len(values) - 1)] = value
+
+    return value
+
+
+def list_remove(a: LoxList, index: float) -> Any:
+    values = a.values
+
+    # Removing the last value is O(1)
+    return values.pop(check_index(index, len(values) - 1))
+
+
+def list_pop(a: LoxList) -> Any:
+    values = a.values
+
+    if not values:
+        raise NativeError("Can't pop from an empty list")
+
+    return values.pop()
+
+
+def list_length(a: LoxList) -> float:
+    return float(len(a))
+
+
+def list_slice(a: LoxList, start: float, end: float) -> LoxList:
+    values = a.values
+    end = check_index(end, len(values))
+    start = check_index(start, end)
+
+    return LoxList(values[start:end])
+
+
+def create_map() -> LoxMap:
+    return LoxMap()
+
+
+def map_get(m: LoxMap, key: Any) -> Any:
+    entry = m.entries.get(map_key(key))
+
+    # A missing key reads as nil
+    if entry is None:
+        return None
+
+    return entry[1]
+
+
+def map_set(m: LoxMap, key: Any, value: Any) -> Any:
+    if type(key) is Rope:
+        key = str(key)
+
+    m.entries[map_key(key)] = (key, value)
+
+    return value
+
+
+def map_has(m: LoxMap, key: Any) -> bool:
+    return map_key(key) in m.entries
+
+
+def map_remove(m: LoxMap, key: Any) -> Any:
+    entry = m.entries.pop(map_key(key), None)
+
+    if entry is None:
+        return None
+
+    return entry[1]
+
+
+def map_length(m: LoxMap) -> float:
+    return float(len(m))
+
+
+def map_keys(m: LoxMap) -> LoxList:
+    return LoxList([key for key, _ in m.entries.values()])
+
+
+def map_values(m: LoxMap) -> LoxList:
+    return LoxList([value for _, value in m.entries.values()])
+
+
+# List and map natives defined in the global environment,
+# the keys and values lists iterate a map in insertion order
+COLLECTION_NATIVES = (
+    NativeFunction("list", create_list, 0),
+    NativeFunction("list_of", list_of, 0, ("any",), variadic=True),
+    NativeFunction("list_append", list_append, 2, ("list", "any")),
+    NativeFunction("list_get", list_get, 2, ("list", "number")),
+    NativeFunction("list_set", list_set, 3, ("list", "number", "any")),
+    NativeFunction("list_remove", list_remove, 2, ("list", "number")),
+    NativeFunction("list_pop", list_pop, 1, ("list",)),
+    NativeFunction("list_length", list_length, 1, ("list",)),
+    NativeFunction("list_slice", list_slice, 3, ("list", "number", "number")),
+    NativeFunction("map", create_map, 0),
+    NativeFunction("map_get", map_get, 2, ("map", "any")),
+    NativeFunction("map_set", map_set, 3, ("map", "any", "any")),
+    NativeFunction("map_has", map_has, 2, ("map", "any")),
+    NativeFunction("map_remove", map_remove, 2, ("map", "any")),
+    NativeFunction("map_length", map_length, 1, ("map",)),
+    NativeFunction("map_keys", map_keys, 1, ("map",)),
+    NativeFunction("map_values", map_values, 1, ("map",)),
+)
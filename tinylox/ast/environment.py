@@ -1,79 +1,55 @@
 """environment module"""
 
-from typing import Any, Self
+from typing import Any
 
 from ..scanner.token import Token
 from ..error.error import RuntimeErrorL
+from .frame import Cell
 
 
 class Environment:
     """
-    Represents a variables environment
+    Represents the global variables environment,
+    every global lives in a cell it keeps for good, so a read
+    can cache the cell and never look the name up again
     """
 
-    def __init__(self, enclosing: Self = None):
+    def __init__(self):
         self.values = {}
-        self.enclosing = enclosing
 
-    def get(self, name: Token) -> Any:
-        """
-        Resolves a variable
-        """
-
-        value = self.values.get(name.lexeme)
-
-        if value is not None:
-            return value
-
-        if self.enclosing is not None:
-            return self.enclosing.get(name)
-
-        raise RuntimeErrorL(name, "Undefined variable '" + name.lexeme + "'")
-
-    def __ancestor(self, distance: int) -> Self:
+    def cell(self, name: Token) -> Cell:
         """
-        Return an environement at a given position
+        Resolves the cell of a variable
         """
 
-        environment = self
-
-        for _ in range(distance):
-            environment = environment.enclosing
+        try:
+            return self.values[name.lexeme]
+        except KeyError:
+            raise RuntimeErrorL(name, "Undefined variable '" + name.lexeme + "'")
 
-        return environment
-
-    def get_at(self, distance: int, name: str) -> Any:
+    def get(self, name: Token) -> Any:
         """
-        Return a value from an environment at distance `distance`
+        Resolves a variable
         """
 
-        return self.__ancestor(distance).values.get(name)
+        return self.cell(name).value
 
     def assign(self, name: Token, value: Any):
         """
         Update a variable value
         """
 
-        if name.lexeme in self.values.keys():
-            self.values[name.lexeme] = value
-            return
-
-        if self.enclosing is not None:
-            self.enclosing.assign(name, value)
-            return
-
-        raise RuntimeErrorL(name, "Undefined variable '" + name.lexeme + "'")
-
-    def assign_at(self, distance: int, name: Token, value: Any):
-        """
-        Update a variable on an environent at a certain distance
-        """
-
-        self.__ancestor(distance).values[name] = value
+        self.cell(name).value = value
 
     def define(self, name: str, value: Any):
         """
-        Add a variable with its value
+        Add a variable with its value, a redefined variable
+        keeps its cell
         """
 
-        self.values[name] = value
+        cell = self.values.get(name)
+
+        if cell is None:
+            self.values[name] = Cell(value)
+        else:
+            cell.value = value
@@ -1,6 +1,7 @@
 from ..scanner.token import Token
-from typing import Any, List
+from typing import Any, Dict, List
 from dataclasses import dataclass
+from .frame import VariableKind, FrameLayout, Cell
 
 
 class Visitor:
@@ -26,6 +27,7 @@ class Binary(Expr):
     left: Expr
     operator: Token
     right: Expr
+    handler: Any = None
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_binary_expr(self)
@@ -77,6 +79,8 @@ class Assign(Expr):
 
     name: Token
     value: Expr
+    kind: VariableKind = VariableKind.GLOBAL
+    slot: int = 0
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_assign_expr(self)
@@ -90,6 +94,7 @@ class Unary(Expr):
 
     operator: Token
     right: Expr
+    handler: Any = None
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_unary_expr(self)
@@ -102,6 +107,9 @@ class Variable(Expr):
     """
 
     name: Token
+    kind: VariableKind = VariableKind.GLOBAL
+    slot: int = 0
+    cell: Cell = None
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_variable_expr(self)
@@ -116,11 +124,94 @@ class Call(Expr):
     callee: Expr
     paren: Token
     arguments: List[Expr]
+    cache: Dict[Any, Any] = None
+    hits: int = 0
+    misses: int = 0
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_call_expr(self)
 
 
+@dataclass
+class Get(Expr):
+    """
+    Get Expr
+    """
+
+    object: Expr
+    name: Token
+    shape: Any = None
+    index: int = -1
+    method: Any = None
+
+    def accept(self, visitor: Visitor) -> Any:
+        return visitor.visit_get_expr(self)
+
+
+@dataclass
+class Set(Expr):
+    """
+    Set Expr
+    """
+
+    object: Expr
+    name: Token
+    value: Expr
+    shape: Any = None
+    index: int = -1
+    transition: Any = None
+
+    def accept(self, visitor: Visitor) -> Any:
+        return visitor.visit_set_expr(self)
+
+
+@dataclass
+class Invoke(Expr):
+    """
+    Invoke Expr
+    """
+
+    object: Expr
+    name: Token
+    paren: Token
+    arguments: List[Expr]
+    cache: Dict[Any, Any] = None
+    hits: int = 0
+    misses: int = 0
+
+    def accept(self, visitor: Visitor) -> Any:
+        return visitor.visit_invoke_expr(self)
+
+
+@dataclass
+class This(Expr):
+    """
+    This Expr
+    """
+
+    keyword: Token
+    kind: VariableKind = VariableKind.GLOBAL
+    slot: int = 0
+
+    def accept(self, visitor: Visitor) -> Any:
+        return visitor.visit_this_expr(self)
+
+
+@dataclass
+class Super(Expr):
+    """
+    Super Expr
+    """
+
+    keyword: Token
+    method: Token
+    superclass: Expr
+    instance: Expr
+
+    def accept(self, visitor: Visitor) -> Any:
+        return visitor.visit_super_expr(self)
+
+
 class Statement:
     def accept(self, _: Visitor) -> Any:
         """
@@ -163,11 +254,25 @@ class ReturnStatement(Statement):
 
     keyword: Token
     value: Expr
+    tail_call: bool = False
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_return_statement(self)
 
 
+@dataclass
+class YieldStatement(Statement):
+    """
+    YieldStatement Statement
+    """
+
+    keyword: Token
+    value: Expr
+
+    def accept(self, visitor: Visitor) -> Any:
+        return visitor.visit_yield_statement(self)
+
+
 @dataclass
 class VarStatement(Statement):
     """
@@ -176,6 +281,8 @@ class VarStatement(Statement):
 
     name: Token
     initializer: Expr
+    kind: VariableKind = VariableKind.GLOBAL
+    slot: int = 0
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_var_statement(self)
@@ -188,6 +295,7 @@ class BlockStatement(Statement):
     """
 
     statements: List[Statement]
+    yields: bool = False
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_block_statement(self)
@@ -202,6 +310,7 @@ class IfStatement(Statement):
     condition: Expr
     then_branch: Statement
     else_branch: Statement
+    yields: bool = False
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_if_statement(self)
@@ -215,6 +324,7 @@ class WhileStatement(Statement):
 
     condition: Expr
     body: Statement
+    yields: bool = False
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_while_statement(self)
@@ -229,11 +339,52 @@ class FunctionStatement(Statement):
     name: Token
     parameters: List[Token]
     body: List[Statement]
+    kind: VariableKind = VariableKind.GLOBAL
+    slot: int = 0
+    layout: FrameLayout = None
+    pure: bool = False
+    generator: bool = False
 
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_function_statement(self)
 
 
+@dataclass
+class ClassStatement(Statement):
+    """
+    ClassStatement Statement
+    """
+
+    name: Token
+    superclass: Variable
+    methods: List[FunctionStatement]
+    kind: VariableKind = VariableKind.GLOBAL
+    slot: int = 0
+    super_declaration: VarStatement = None
+
+    def accept(self, visitor: Visitor) -> Any:
+        return visitor.visit_class_statement(self)
+
+
+@dataclass
+class ForStatement(Statement):
+    """
+    ForStatement Statement
+    """
+
+    initializer: VarStatement
+    operator: Token
+    limit: Expr
+    step: float
+    body: Statement
+    loop: BlockStatement
+    yields: bool = False
+    counted: bool = False
+
+    def accept(self, visitor: Visitor) -> Any:
+        return visitor.visit_for_statement(self)
+
+
 class Visitor:
     def visit_binary_expr(self, expr: Binary) -> Any:
         """
@@ -291,6 +442,41 @@ class Visitor:
 
         raise Exception("Not implemented")
 
+    def visit_get_expr(self, expr: Get) -> Any:
+        """
+        Operates on a Get expression
+        """
+
+        raise Exception("Not implemented")
+
+    def visit_set_expr(self, expr: Set) -> Any:
+        """
+        Operates on a Set expression
+        """
+
+        raise Exception("Not implemented")
+
+    def visit_invoke_expr(self, expr: Invoke) -> Any:
+        """
+        Operates on a Invoke expression
+        """
+
+        raise Exception("Not implemented")
+
+    def visit_this_expr(self, expr: This) -> Any:
+        """
+        Operates on a This expression
+        """
+
+        raise Exception("Not implemented")
+
+    def visit_super_expr(self, expr: Super) -> Any:
+        """
+        Operates on a Super expression
+        """
+
+        raise Exception("Not implemented")
+
     def visit_expression_statement(self, statement: ExpressionStatement) -> Any:
         """
         Operates on a Expression statement
@@ -312,6 +498,13 @@ class Visitor:
 
         raise Exception("Not implemented")
 
+    def visit_yield_statement(self, statement: YieldStatement) -> Any:
+        """
+        Operates on a Yield statement
+        """
+
+        raise Exception("Not implemented")
+
     def visit_var_statement(self, statement: VarStatement) -> Any:
         """
         Operates on a Var statement
@@ -346,3 +539,17 @@ class Visitor:
         """
 
         raise Exception("Not implemented")
+
+    def visit_class_statement(self, statement: ClassStatement) -> Any:
+        """
+        Operates on a Class statement
+        """
+
+        raise Exception("Not implemented")
+
+    def visit_for_statement(self, statement: ForStatement) -> Any:
+        """
+        Operates on a For statement
+        """
+
+        raise Exception("Not implemented")
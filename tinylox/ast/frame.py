@@ -0,0 +1,96 @@
+"""frame module"""
+
+from typing import Any, List, Tuple
+from enum import Enum
+
+# Most frames a layout keeps for reuse, the frames of deeper
+# recursions are freed once their call is over
+POOL_SIZE = 64
+
+
+class VariableKind(Enum):
+    """
+    Where a resolved variable lives at runtime
+    """
+
+    # Slot of the current frame
+    LOCAL = "local"
+    # Slot of the current frame holding a `Cell`, the variable is captured
+    CELL = "cell"
+    # `Cell` captured by the current function
+    UPVALUE = "upvalue"
+    # Global environment
+    GLOBAL = "global"
+
+
+class Cell:
+    """
+    Shared box for a local variable captured by a closure
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any = None):
+        self.value = value
+
+
+class FrameLayout:
+    """
+    Frame layout of a function, computed once by the resolver,
+    the parameters take the first slots of the frame
+    """
+
+    def __init__(
+        self,
+        arity: int,
+        size: int,
+        cells: List[int],
+        upvalues: List[Tuple[bool, int]],
+    ):
+        self.arity = arity
+        self.size = size
+        # Parameter slots captured by a closure
+        self.cells = cells
+        # Where the closure takes its cells from, the enclosing frame
+        # (`True`) or the enclosing function upvalues (`False`)
+        self.upvalues = upvalues
+
+        # Frames released by finished calls, ready to be reused
+        self.frames = []
+        self.blank = (None,) * size
+
+        # Frames made because the pool was empty
+        self.allocated = 0
+
+    def allocate(self) -> List[Any]:
+        """
+        Make a new frame, when the pool is empty
+        """
+
+        self.allocated += 1
+
+        return [None] * self.size
+
+    def acquire(self) -> List[Any]:
+        """
+        Take a frame from the pool, or make one
+        """
+
+        frames = self.frames
+
+        return frames.pop() if frames else self.allocate()
+
+    def release(self, frame: List[Any]):
+        """
+        Give a frame back once its call is over, it is cleared
+        so it does not keep its values alive.
+        Past `POOL_SIZE` frames it is left to the garbage collector
+        """
+
+        frames = self.frames
+
+        if len(frames) < POOL_SIZE:
+            frame.clear()
+            frame.extend(self.blank)
+
+            frames.append(frame)
@@ -4,8 +4,7 @@ from typing import List, Any
 
 from .callable import LoxCallable
 from .expr import FunctionStatement
-from .environment import Environment
-from ._return import Return
+from .frame import Cell
 
 
 class LoxFunction(LoxCallable):
@@ -13,25 +12,37 @@ class LoxFunction(LoxCallable):
     Function expression back end
     """
 
-    def __init__(self, declaration: FunctionStatement, closures: Environment):
-        self.__declaration = declaration
-        self.__closures = closures
+    def __init__(
+        self,
+        declaration: FunctionStatement,
+        upvalues: List[Cell],
+        initializer: bool = False,
+    ):
+        self.declaration = declaration
+        self.layout = declaration.layout
+        self.key = self.layout
+        # Only the variables the function uses are kept alive
+        self.upvalues = upvalues
+        # Method named `init` of a class
+        self.initializer = initializer
+        # Calling a generator function makes a generator
+        self.generator = declaration.generator
 
     def __call__(self, interpreter: object, arguments: List[Any]) -> Any:
-        environement = Environment(self.__closures)
+        frame = self.layout.acquire()
+        frame[: len(arguments)] = arguments
 
-        for argument, declaration in zip(arguments, self.__declaration.parameters):
-            environement.define(declaration.lexeme, argument)
+        # The call reports its errors at the line of the call site
+        # running a native or a class, the declaration one otherwise
+        token = interpreter.call_site or self.declaration.name
 
-        try:
-            interpreter.execute_block(self.__declaration.body, environement)
-        except Return as error:
-            return error.value
+        if self.generator:
+            return interpreter.start_generator(self, frame, token)
 
-        return None
+        return interpreter.call_function(self, frame, token)
 
     def __str__(self) -> str:
-        return "<fn " + self.__declaration.name.lexeme + ">"
+        return "<fn " + self.declaration.name.lexeme + ">"
 
     def arity(self) -> int:
-        return len(self.__declaration.parameters)
+        return self.layout.arity
@@ -0,0 +1,130 @@
+"""generator module"""
+
+from typing import Any, Generator, List
+
+from .function import LoxFunction
+from .native import NativeFunction, register_type
+from ..error.error import NativeError
+from ..scanner.token import Token
+
+
+class LoxGenerator:
+    """
+    Suspended call of a generator function, its body runs up to
+    the next `yield` whenever a value is asked.
+    Knowing if the generator is done runs its body up to the next
+    value, which is kept for the next `next`
+    """
+
+    __slots__ = (
+        "interpreter",
+        "function",
+        "frame",
+        "token",
+        "body",
+        "value",
+        "ready",
+        "finished",
+        "running",
+    )
+
+    def __init__(
+        self,
+        interpreter: object,
+        function: LoxFunction,
+        frame: List[Any],
+        token: Token,
+        body: Generator[Any, None, Any],
+    ):
+        self.interpreter = interpreter
+        self.function = function
+        # Owned by the generator, it is never recycled
+        self.frame = frame
+        self.token = token
+        self.body = body
+
+        self.value = None
+        self.ready = False
+        self.finished = False
+        self.running = False
+
+    def __advance(self):
+        """
+        Run the body up to its next value unless it is already known
+        """
+
+        if self.ready or self.finished:
+            return
+
+        if self.running:
+            raise NativeError("Generator is already running")
+
+        self.running = True
+
+        try:
+            self.value = self.interpreter.resume_generator(self)
+            self.ready = True
+        except StopIteration:
+            self.finished = True
+            self.frame = None
+        finally:
+            self.running = False
+
+    def done(self) -> bool:
+        """
+        Check if the body has no value left
+        """
+
+        self.__advance()
+
+        return self.finished
+
+    def next(self) -> Any:
+        """
+        Return the next value of the body
+        """
+
+        self.__advance()
+
+        if self.finished:
+            raise NativeError("Generator is exhausted")
+
+        value = self.value
+
+        self.value = None
+        self.ready = False
+
+        return value
+
+    def __str__(self) -> str:
+        return "<generator " + self.function.declaration.name.lexeme + ">"
+
+
+def check_generator(value: Any) -> LoxGenerator:
+    """
+    Check if a value is a generator
+    """
+
+    if type(value) is not LoxGenerator:
+        raise NativeError("Operand must be a generator")
+
+    return value
+
+
+register_type("generator", check_generator)
+
+
+def next_value(generator: LoxGenerator) -> Any:
+    return generator.next()
+
+
+def is_done(generator: LoxGenerator) -> bool:
+    return generator.done()
+
+
+# Generator natives defined in the global environment,
+# `while (!done(g)) { var value = next(g); ... }` walks a generator
+GENERATOR_NATIVES = (
+    NativeFunction("next", next_value, 1, ("generator",)),
+    NativeFunction("done", is_done, 1, ("generator",)),
+)
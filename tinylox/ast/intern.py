@@ -0,0 +1,85 @@
+"""intern module"""
+
+from sys import getsizeof
+from typing import Dict
+
+# Longest runtime string interned
+INTERN_LENGTH = 64
+
+# Memory the interned strings may take
+INTERN_BYTES = 1 << 20
+
+
+class InternTable:
+    """
+    Interpreter-owned table of unique strings, equal interned strings
+    are the same object so comparing them stops at identity
+    """
+
+    def __init__(self, max_bytes: int = INTERN_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.strings: Dict[str, str] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, string: str) -> str:
+        """
+        Return the unique copy of `string`, it is added
+        to the table while the memory cap allows it
+        """
+
+        unique = self.strings.get(string)
+
+        if unique is not None:
+            self.hits += 1
+
+            return unique
+
+        return self.__add(string)
+
+    def intern_short(self, string: str) -> str:
+        """
+        Intern a runtime string if it is short enough
+        """
+
+        if len(string) > INTERN_LENGTH:
+            return string
+
+        unique = self.strings.get(string)
+
+        if unique is not None:
+            self.hits += 1
+
+            return unique
+
+        return self.__add(string)
+
+    def __add(self, string: str) -> str:
+        """
+        Add a missing string to the table while the memory cap allows it
+        """
+
+        self.misses += 1
+
+        size = getsizeof(string)
+
+        if self.bytes + size <= self.max_bytes:
+            self.strings[string] = string
+            self.bytes += size
+
+        return string
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return the table size and hit rate
+        """
+
+        return {
+            "strings": len(self.strings),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / max(self.hits + self.misses, 1),
+        }
@@ -1,9 +1,13 @@
 """interpreter module"""
 
-from typing import Any, List
-from sys import stderr
-
-from ..error.error import RuntimeErrorL, Error
+from operator import ge, gt, le, lt
+from typing import Any, Callable, Dict, Generator, List, Sequence, Tuple
+from inspect import signature as python_signature
+from sys import maxsize, stderr
+from threading import get_ident
+from weakref import WeakValueDictionary
+
+from ..error.error import RuntimeErrorL, NativeError, Error
 from ..scanner.token import TokenKind, Token
 from .expr import (
     ExpressionStatement,
@@ -13,7 +17,6 @@ from .expr import (
     Grouping,
     Literal,
     Unary,
-    Expr,
     Statement,
     VarStatement,
     Variable,
@@ -25,12 +28,61 @@ from .expr import (
     Call,
     FunctionStatement,
     ReturnStatement,
+    YieldStatement,
+    ForStatement,
+    ClassStatement,
+    Get,
+    Set,
+    Invoke,
+    This,
+    Super,
 )
 from .environment import Environment
+from .frame import VariableKind, Cell, FrameLayout
 from .callable import LoxCallable
 from .function import LoxFunction
-from .clock import Clock
-from ._return import Return
+from .classes import LoxClass, LoxInstance, BoundMethod
+from .operators import BINARY, UNARY, interning_add, is_truthy, stringify
+from .intern import InternTable
+from .output import Output
+from .native import NativeFunction, CORE_NATIVES
+from .array import ARRAY_NATIVES
+from .collection import COLLECTION_NATIVES
+from .strings import STRING_NATIVES
+from .generator import LoxGenerator, GENERATOR_NATIVES
+from .memoize import MemoizedFunction, Memoize, MEMO_SIZE
+from .stack import StackBudget, DEEP_THREADS
+from ._return import Completion
+
+# Looking up an enum member on its class is slow, hot paths use these aliases
+LOCAL = VariableKind.LOCAL
+CELL = VariableKind.CELL
+UPVALUE = VariableKind.UPVALUE
+RETURN = Completion.RETURN
+TAIL_CALL = Completion.TAIL_CALL
+
+# Comparison of a counted for loop by its condition operator
+COMPARE = {
+    TokenKind.LESS: lt,
+    TokenKind.LESS_EQUAL: le,
+    TokenKind.GREATER: gt,
+    TokenKind.GREATER_EQUAL: ge,
+}
+
+# Callees a call site remembers before it is megamorphic
+POLYMORPHIC_LIMIT = 4
+
+
+def inner(statement: Statement) -> Sequence[Statement]:
+    """
+    Return the statements run by a branch or a loop body,
+    a block shares the frame of its enclosing statements
+    """
+
+    if type(statement) is BlockStatement:
+        return statement.statements
+
+    return (statement,)
 
 
 class Interpreter(Visitor):
@@ -38,222 +90,943 @@ class Interpreter(Visitor):
     AST interpreter
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_depth: int = None,
+        memoize: bool = False,
+        memo_size: int = MEMO_SIZE,
+        output: Output = None,
+    ):
         self.globals = Environment()
-        self.__environment = self.globals
 
-        self.globals.define("clock", Clock)
-
-    def __evaluate(self, expr: Expr) -> Any:
+        # String literals and short runtime strings
+        self.strings = InternTable()
+
+        # Operator handlers given to the `Binary` and `Unary` nodes
+        self.binary = {
+            **BINARY,
+            TokenKind.PLUS: interning_add(self.strings.intern_short),
+        }
+        self.unary = UNARY
+
+        # Where the print statement writes, standard output by default
+        self.output = Output() if output is None else output
+
+        # Running Lox calls, with the token of their call site
+        self.call_stack: List[Tuple[LoxFunction, Token]] = []
+
+        # Without a maximum depth the calls nest on the current thread
+        # up to its recursion limit, with one the program runs in deep
+        # mode, on a thread sized for `max_depth` nested calls
+        self.deep = max_depth is not None
+        self.max_depth = max_depth if self.deep else maxsize
+
+        # Thread running the statements
+        self.thread_id = None
+
+        # Call site of the callable running, the Lox calls it makes
+        # report their errors at its line
+        self.call_site: Token = None
+
+        # Slots of the running function and the cells it captured
+        self.__frame = []
+        self.__upvalues = []
+
+        # Value of the last `Completion.RETURN`
+        self.__returned = None
+
+        # Function, frame and call token of the last `Completion.TAIL_CALL`
+        self.tail_call = None
+
+        # Call sites run at least once, for their inline cache statistics
+        self.call_sites: List[Call] = []
+
+        # Memoize the functions the resolver proved pure
+        self.memoize = memoize
+        self.memo_size = memo_size
+        # Memoized functions by declaration, and the memoized closures
+        # capturing variables by closure, these are held only while
+        # the program uses them
+        self.memoized: Dict[int, MemoizedFunction] = {}
+        self.memoized_closures: WeakValueDictionary[int, MemoizedFunction] = (
+            WeakValueDictionary()
+        )
+
+        self.globals.define("memoize", Memoize())
+
+        for native in (
+            CORE_NATIVES
+            + ARRAY_NATIVES
+            + COLLECTION_NATIVES
+            + STRING_NATIVES
+            + GENERATOR_NATIVES
+        ):
+            self.globals.define(native.name, native)
+
+    def register_native(
+        self,
+        name: str,
+        function: Callable[..., Any],
+        arity: int = None,
+        signature: Sequence[str] = None,
+        variadic: bool = False,
+    ) -> NativeFunction:
         """
-        Evaluate an expression node
+        Define a Python function as a global Lox function.
+        `signature` gives the type name of every parameter ("any",
+        "number", "string", "bool", "function", "list", "map", "array"
+        or a type from `register_type`), the arguments are checked
+        and given positionally. A variadic native takes any amount of
+        extra arguments of the last type of its signature.
+        The arity defaults to the signature or Python parameters count
         """
 
-        return expr.accept(self)
+        if arity is None:
+            if signature is not None:
+                arity = len(signature) - variadic
+            else:
+                parameters = python_signature(function).parameters
+                arity = len(parameters) - variadic
+
+        native = NativeFunction(name, function, arity, signature, variadic)
+        self.globals.define(name, native)
+
+        return native
 
-    def __check_number_operand(self, operator: Token, operand: Any):
+    def native(
+        self, name: str = None, signature: Sequence[str] = None, variadic: bool = False
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         """
-        Check if a value is a float
+        Decorator registering a Python function as a native,
+        named like the function by default
         """
 
-        if type(operand) == float:
-            return
+        def register(function: Callable[..., Any]) -> Callable[..., Any]:
+            self.register_native(
+                name or function.__name__,
+                function,
+                signature=signature,
+                variadic=variadic,
+            )
+
+            return function
 
-        raise RuntimeErrorL(operator, "Operand must be a number")
+        return register
 
-    def __check_number_operands(self, operator: Token, left: Any, right: Any):
+    def resolve_frame_size(self, size: int):
         """
-        Check if an operation includes two floats
+        Allocate the frame holding the top-level block variables
         """
 
-        self.__check_number_operand(operator, left)
-        self.__check_number_operand(operator, right)
+        self.__frame = [None] * size
 
     def visit_binary_expr(self, expr: Binary) -> Any:
-        left = self.__evaluate(expr.left)
-        right = self.__evaluate(expr.right)
-
-        match expr.operator.kind:
-            case TokenKind.MINUS:
-                self.__check_number_operands(expr.operator, left, right)
-                return left - right
-            case TokenKind.STAR:
-                self.__check_number_operands(expr.operator, left, right)
-                return left * right
-            case TokenKind.SLASH:
-                self.__check_number_operands(expr.operator, left, right)
-                return left / right
-            case TokenKind.PLUS:
-                match left, right:
-                    case str(), str():
-                        return left + right
-                    case float(), float():
-                        return left + right
-
-                raise RuntimeErrorL(
-                    expr.operator, "Operands must be two numbers or two strings"
-                )
-            case TokenKind.GREATER:
-                self.__check_number_operands(expr.operator, left, right)
-                return left > right
-            case TokenKind.GREATER_EQUAL:
-                self.__check_number_operands(expr.operator, left, right)
-                return left >= right
-            case TokenKind.LESS:
-                self.__check_number_operands(expr.operator, left, right)
-                return left < right
-            case TokenKind.LESS_EQUAL:
-                self.__check_number_operands(expr.operator, left, right)
-                return left <= right
-            case TokenKind.BANG_EQUAL:
-                return left != right
-            case TokenKind.EQUAL_EQUAL:
-                return left == right
-
-        return None
+        return expr.handler(
+            expr.operator, expr.left.accept(self), expr.right.accept(self)
+        )
 
     def visit_variable_expr(self, expr: Variable) -> Any:
-        return self.__environment.get(expr.name)
+        kind = expr.kind
 
-    def visit_grouping_expr(self, expr: Grouping) -> Any:
-        return self.__evaluate(expr.expression)
+        if kind is LOCAL:
+            return self.__frame[expr.slot]
 
-    def visit_literal_expr(self, expr: Literal) -> Any:
-        return expr.value
+        if kind is CELL:
+            return self.__frame[expr.slot].value
 
-    def __is_truthy(self, obj: Any) -> bool:
-        """
-        Handle operation on a boolean `obj`
-        """
+        if kind is UPVALUE:
+            return self.__upvalues[expr.slot].value
 
-        match obj:
-            case bool():
-                return obj
-            case None:
-                return False
+        # Inline cache of the global cell, a global keeps its cell for good
+        cell = expr.cell
 
-        return True
+        if cell is None:
+            cell = self.globals.cell(expr.name)
+            expr.cell = cell
 
-    def visit_unary_expr(self, expr: Unary) -> Any:
-        right = self.__evaluate(expr.right)
+        return cell.value
 
-        match expr.operator.kind:
-            case TokenKind.MINUS:
-                self.__check_number_operand(expr.operator, right)
+    def visit_grouping_expr(self, expr: Grouping) -> Any:
+        return expr.expression.accept(self)
 
-                return -float(right)
-            case TokenKind.BANG:
-                return self.__is_truthy(right)
+    def visit_literal_expr(self, expr: Literal) -> Any:
+        return expr.value
 
-        return None
+    def visit_unary_expr(self, expr: Unary) -> Any:
+        return expr.handler(expr.operator, expr.right.accept(self))
 
     def visit_expression_statement(self, statement: ExpressionStatement) -> Any:
-        self.__evaluate(statement.expression)
+        statement.expression.accept(self)
 
     def visit_print_statement(self, statement: PrintStatement) -> Any:
-        value = self.__evaluate(statement.expression)
-        value_str = self.__stringify(value)
+        value = statement.expression.accept(self)
 
-        print(value_str)
+        self.output.write_line(stringify(value))
 
     def visit_var_statement(self, statement: VarStatement) -> Any:
         value = None
 
         if statement.initializer is not None:
-            value = self.__evaluate(statement.initializer)
+            value = statement.initializer.accept(self)
 
-        self.__environment.define(statement.name.lexeme, value)
+        self.__define(statement, value)
 
-    def visit_assign_expr(self, expr: Assign) -> Any:
-        value = self.__evaluate(expr.value)
+    def __define(self, statement: VarStatement | FunctionStatement, value: Any):
+        """
+        Bind a declared variable to its first value
+        """
 
-        self.__environment.assign(expr.name, value)
+        kind = statement.kind
+
+        if kind is LOCAL:
+            self.__frame[statement.slot] = value
+        elif kind is CELL:
+            self.__frame[statement.slot] = Cell(value)
+        else:
+            self.globals.define(statement.name.lexeme, value)
+
+    def visit_assign_expr(self, expr: Assign) -> Any:
+        value = expr.value.accept(self)
+        kind = expr.kind
+
+        if kind is LOCAL:
+            self.__frame[expr.slot] = value
+        elif kind is CELL:
+            self.__frame[expr.slot].value = value
+        elif kind is UPVALUE:
+            self.__upvalues[expr.slot].value = value
+        else:
+            self.globals.assign(expr.name, value)
 
         return value
 
+    def __capture(self, statement: FunctionStatement) -> List[Cell]:
+        """
+        Return the cells a closure of `statement` captures
+        from the running function
+        """
+
+        return [
+            self.__frame[index] if is_local else self.__upvalues[index]
+            for is_local, index in statement.layout.upvalues
+        ]
+
     def visit_function_statement(self, statement: FunctionStatement) -> Any:
-        f = LoxFunction(statement, self.__environment)
+        captured = statement.kind is CELL
+
+        # The cell exists before the closure so a local function can see itself
+        if captured:
+            cell = Cell()
+            self.__frame[statement.slot] = cell
+
+        f = LoxFunction(statement, self.__capture(statement))
+
+        if statement.pure and self.memoize:
+            f = self.memoize_function(f)
+
+        if captured:
+            cell.value = f
+        else:
+            self.__define(statement, f)
+
+    def visit_class_statement(self, statement: ClassStatement) -> Any:
+        superclass = None
+
+        if statement.superclass is not None:
+            superclass = statement.superclass.accept(self)
+
+            if type(superclass) is not LoxClass:
+                raise RuntimeErrorL(
+                    statement.superclass.name, "Superclass must be a class"
+                )
+
+        captured = statement.kind is CELL
+
+        # The methods can see their own class and its superclass
+        if captured:
+            cell = Cell()
+            self.__frame[statement.slot] = cell
+
+        if superclass is not None:
+            self.__define(statement.super_declaration, superclass)
+
+        methods = {
+            method.name.lexeme: LoxFunction(
+                method, self.__capture(method), method.name.lexeme == "init"
+            )
+            for method in statement.methods
+        }
+        cls = LoxClass(statement.name.lexeme, superclass, methods)
+
+        if captured:
+            cell.value = cls
+        else:
+            self.__define(statement, cls)
+
+    def __instance_error(self, expr: Get | Set | Invoke) -> RuntimeErrorL:
+        """
+        Return the error of a property used on a value that is not an instance
+        """
+
+        return RuntimeErrorL(expr.name, "Only instances have properties")
+
+    def __property_error(self, expr: Get | Invoke) -> RuntimeErrorL:
+        """
+        Return the error of a property neither a field nor a method
+        """
+
+        return RuntimeErrorL(expr.name, f"Undefined property '{expr.name.lexeme}'")
+
+    def visit_get_expr(self, expr: Get) -> Any:
+        instance = expr.object.accept(self)
+
+        if type(instance) is not LoxInstance:
+            raise self.__instance_error(expr)
+
+        # Inline cache, valid for the instances sharing the cached shape
+        if instance.shape is expr.shape:
+            index = expr.index
+
+            if index >= 0:
+                return instance.fields[index]
+
+            return BoundMethod(instance, expr.method)
+
+        shape = instance.shape
+        index = shape.slots.get(expr.name.lexeme)
+
+        # Fields shadow methods
+        if index is not None:
+            expr.shape = shape
+            expr.index = index
+
+            return instance.fields[index]
+
+        method = shape.cls.methods.get(expr.name.lexeme)
+
+        if method is None:
+            raise self.__property_error(expr)
+
+        expr.shape = shape
+        expr.index = -1
+        expr.method = method
+
+        return BoundMethod(instance, method)
+
+    def visit_set_expr(self, expr: Set) -> Any:
+        instance = expr.object.accept(self)
+
+        if type(instance) is not LoxInstance:
+            raise self.__instance_error(expr)
+        value = expr.value.accept(self)
 
-        self.__environment.define(statement.name.lexeme, f)
+        # Inline cache, valid for the instances sharing the cached shape,
+        # a new field moves the instance to the cached transition
+        if instance.shape is expr.shape:
+            transition = expr.transition
 
-    def execute_block(self, statements: List[Statement], environment: Environment):
+            if transition is None:
+                instance.fields[expr.index] = value
+            else:
+                instance.shape = transition
+                instance.fields.append(value)
+
+            return value
+
+        shape = instance.shape
+        index = shape.slots.get(expr.name.lexeme)
+
+        expr.shape = shape
+
+        if index is not None:
+            expr.index = index
+            expr.transition = None
+
+            instance.fields[index] = value
+        else:
+            expr.transition = shape.add(expr.name.lexeme)
+
+            instance.shape = expr.transition
+            instance.fields.append(value)
+
+        return value
+
+    def __call_method(
+        self, expr: Invoke, instance: LoxInstance, method: LoxFunction
+    ) -> Any:
         """
-        Evaluate a block
+        Call a method whose arity matches the call site,
+        the instance takes the first slot of its frame
         """
 
-        previous = self.__environment
+        frame = self.__bind_arguments(expr, method.layout, 1)
+        frame[0] = instance
+
+        if method.generator:
+            return self.start_generator(method, frame, expr.paren)
+
+        value = self.call_function(method, frame, expr.paren)
+
+        # An initializer always returns its instance
+        if method.initializer:
+            return instance
+
+        return value
+
+    def visit_invoke_expr(self, expr: Invoke) -> Any:
+        instance = expr.object.accept(self)
+
+        if type(instance) is not LoxInstance:
+            raise self.__instance_error(expr)
+
+        # Inline cache of the methods by shape, the instances
+        # of a shape have the same fields and methods
+        method = expr.cache.get(instance.shape)
+
+        if method is not None:
+            expr.hits += 1
+
+            return self.__call_method(expr, instance, method)
+
+        shape = instance.shape
+        index = shape.slots.get(expr.name.lexeme)
+
+        # A field holding a callable is called like any callee
+        if index is not None:
+            return self.__call_cached(expr, instance.fields[index])
+
+        method = shape.cls.methods.get(expr.name.lexeme)
+
+        if method is None:
+            raise self.__property_error(expr)
+
+        if len(expr.arguments) != method.layout.arity:
+            raise self.__arity_error(expr, method.layout.arity)
+
+        if not expr.hits and not expr.misses:
+            self.call_sites.append(expr)
+
+        expr.misses += 1
+
+        if len(expr.cache) < POLYMORPHIC_LIMIT:
+            expr.cache[shape] = method
+
+        return self.__call_method(expr, instance, method)
+
+    def visit_this_expr(self, expr: This) -> Any:
+        kind = expr.kind
+
+        if kind is LOCAL:
+            return self.__frame[expr.slot]
+
+        if kind is CELL:
+            return self.__frame[expr.slot].value
+
+        return self.__upvalues[expr.slot].value
+
+    def visit_super_expr(self, expr: Super) -> Any:
+        superclass = expr.superclass.accept(self)
+        method = superclass.methods.get(expr.method.lexeme)
+
+        if method is None:
+            raise RuntimeErrorL(
+                expr.method, f"Undefined property '{expr.method.lexeme}'"
+            )
+
+        return BoundMethod(expr.instance.accept(self), method)
+
+    def memoize_function(self, function: LoxFunction) -> MemoizedFunction:
+        """
+        Return a memoized version of `function`, its cache
+        statistics are kept for profiling.
+        The closures of a declaration capturing no variable all compute
+        the same results, so they share a single cache
+        """
+
+        if function.upvalues:
+            # A memoized closure keeps its closure alive, so its id
+            # is not reused while it is held
+            table, key = self.memoized_closures, id(function)
+        else:
+            table, key = self.memoized, id(function.declaration)
+
+        memoized = table.get(key)
+
+        if memoized is None:
+            memoized = MemoizedFunction(function, self.memo_size)
+            table[key] = memoized
+
+        return memoized
+
+    def memo_stats(self) -> List[Dict[str, Any]]:
+        """
+        Return the cache statistics of every memoized function,
+        the memoized closures no longer used are left out
+        """
+
+        return [
+            {
+                "function": str(memoized),
+                "hits": memoized.hits,
+                "misses": memoized.misses,
+                "evictions": memoized.evictions,
+                "hit_rate": memoized.hits / max(memoized.hits + memoized.misses, 1),
+            }
+            for memoized in (
+                *self.memoized.values(),
+                *self.memoized_closures.values(),
+            )
+        ]
+
+    def intern_stats(self) -> Dict[str, float]:
+        """
+        Return the string interning statistics
+        """
+
+        return self.strings.stats()
+
+    def call_function(
+        self, function: LoxFunction, frame: List[Any], token: Token
+    ) -> Any:
+        """
+        Run a function body within a frame already holding its arguments,
+        the frame is recycled once the call is over.
+        A tail call replaces the running function and its frame instead
+        of nesting a new call, so tail recursion runs in constant stack
+        """
+
+        call_stack = self.call_stack
+
+        if len(call_stack) >= self.max_depth:
+            raise RuntimeErrorL(token, "Stack overflow")
+
+        call_stack.append((function, token))
+
+        previous_frame = self.__frame
+        previous_upvalues = self.__upvalues
 
         try:
-            self.__environment = environment
+            while True:
+                layout = function.layout
 
-            for statement in statements:
-                self.__execute(statement)
+                if layout.cells:
+                    for slot in layout.cells:
+                        frame[slot] = Cell(frame[slot])
+
+                self.__frame = frame
+                self.__upvalues = function.upvalues
+
+                completion = None
+
+                for statement in function.declaration.body:
+                    completion = statement.accept(self)
+
+                    if completion is not None:
+                        break
+
+                layout.release(frame)
+
+                if completion is not TAIL_CALL:
+                    break
+
+                function, frame, token = self.tail_call
+                self.tail_call = None
+
+                call_stack[-1] = (function, token)
+        except RecursionError:
+            # The recursion limit bounds the calls out of deep mode,
+            # in deep mode only a recursion outside of the Lox calls
+            # can exhaust it before `max_depth`
+            raise RuntimeErrorL(token, "Stack overflow") from None
         finally:
-            self.__environment = previous
+            call_stack.pop()
+
+            self.__frame = previous_frame
+            self.__upvalues = previous_upvalues
+
+        if completion is None:
+            return None
+
+        value = self.__returned
+        self.__returned = None
+
+        return value
+
+    def start_generator(
+        self, function: LoxFunction, frame: List[Any], token: Token
+    ) -> LoxGenerator:
+        """
+        Make the generator of a generator function call, its body
+        does not run yet and its frame lives as long as the generator
+        """
+
+        for slot in function.layout.cells:
+            frame[slot] = Cell(frame[slot])
+
+        body = self.__run_generator(function.declaration.body)
+
+        return LoxGenerator(self, function, frame, token, body)
+
+    def resume_generator(self, generator: LoxGenerator) -> Any:
+        """
+        Run a generator body up to its next yielded value,
+        `StopIteration` is raised once the body is over
+        """
+
+        call_stack = self.call_stack
+
+        if len(call_stack) >= self.max_depth:
+            raise RuntimeErrorL(generator.token, "Stack overflow")
+
+        call_stack.append((generator.function, generator.token))
+
+        previous_frame = self.__frame
+        previous_upvalues = self.__upvalues
+
+        self.__frame = generator.frame
+        self.__upvalues = generator.function.upvalues
+
+        try:
+            return next(generator.body)
+        except RecursionError:
+            raise RuntimeErrorL(generator.token, "Stack overflow") from None
+        finally:
+            call_stack.pop()
+
+            self.__frame = previous_frame
+            self.__upvalues = previous_upvalues
+
+    def __run_generator(
+        self, statements: Sequence[Statement]
+    ) -> Generator[Any, None, Any]:
+        """
+        Run statements of a generator body, suspended at every `yield`.
+        Only the statements holding a `yield` are run here,
+        the other ones are run by their visitor.
+        It returns the completion of the statements
+        """
+
+        for statement in statements:
+            kind = type(statement)
+
+            if kind is YieldStatement:
+                value = statement.value
+
+                yield None if value is None else value.accept(self)
+
+                completion = None
+            elif not getattr(statement, "yields", False):
+                completion = statement.accept(self)
+            elif kind is BlockStatement:
+                completion = yield from self.__run_generator(statement.statements)
+            elif kind is ForStatement:
+                completion = yield from self.__run_generator(statement.loop.statements)
+            elif kind is IfStatement:
+                branch = statement.else_branch
+
+                if is_truthy(statement.condition.accept(self)):
+                    branch = statement.then_branch
+
+                completion = None
+
+                if branch is not None:
+                    completion = yield from self.__run_generator(inner(branch))
+            else:
+                completion = None
+                body = inner(statement.body)
+
+                while is_truthy(statement.condition.accept(self)):
+                    completion = yield from self.__run_generator(body)
+
+                    if completion is not None:
+                        break
+
+            # A `return` ends the generator
+            if completion is not None:
+                return completion
+
+        return None
 
     def visit_block_statement(self, statement: BlockStatement) -> Any:
-        self.execute_block(statement.statements, Environment(self.__environment))
+        # Block variables live in the slots of the current frame
+        for inner in statement.statements:
+            completion = inner.accept(self)
+
+            if completion is not None:
+                return completion
+
+        return None
 
     def visit_if_statement(self, statement: IfStatement) -> Any:
-        if self.__is_truthy(self.__evaluate(statement.condition)):
-            self.__execute(statement.then_branch)
-        elif statement.else_branch:
-            self.__execute(statement.else_branch)
+        if is_truthy(statement.condition.accept(self)):
+            return statement.then_branch.accept(self)
+
+        if statement.else_branch:
+            return statement.else_branch.accept(self)
+
+        return None
 
     def visit_logical_expr(self, expr: Logical) -> Any:
-        left = self.__evaluate(expr.left)
+        left = expr.left.accept(self)
 
         if expr.operator.kind == TokenKind.OR:
-            if self.__is_truthy(left):
+            if is_truthy(left):
                 return left
         # AND case
         else:
-            if not self.__is_truthy(left):
+            if not is_truthy(left):
                 return left
 
-        return self.__evaluate(expr.right)
+        return expr.right.accept(self)
 
     def visit_while_statement(self, statement: WhileStatement) -> Any:
-        while self.__is_truthy(self.__evaluate(statement.condition)):
-            self.__execute(statement.body)
+        while is_truthy(statement.condition.accept(self)):
+            completion = statement.body.accept(self)
 
-    def visit_call_expr(self, expr: Call) -> Any:
-        callee = self.__evaluate(expr.callee)
+            if completion is not None:
+                return completion
+
+        return None
+
+    def visit_for_statement(self, statement: ForStatement) -> Any:
+        if not statement.counted:
+            return statement.loop.accept(self)
+
+        frame = self.__frame
+        slot = statement.initializer.slot
+
+        counter = statement.initializer.initializer.accept(self)
+        frame[slot] = counter
+
+        limit = statement.limit.accept(self)
+
+        # The generic loop raises the operand errors
+        if type(counter) is not float or type(limit) is not float:
+            return statement.loop.statements[1].accept(self)
+
+        compare = COMPARE[statement.operator.kind]
+        step = statement.step
+        body = statement.body
+
+        # The body can't assign the counter, it only reads the slot
+        while compare(counter, limit):
+            frame[slot] = counter
+
+            completion = body.accept(self)
+
+            if completion is not None:
+                return completion
+
+            counter += step
+
+        return None
+
+    def __arity_error(
+        self, expr: Call, arity: int, variadic: bool = False
+    ) -> RuntimeErrorL:
+        """
+        Return the error of a call with a wrong arguments amount
+        """
+
+        expected = f"at least {arity}" if variadic else str(arity)
+
+        return RuntimeErrorL(
+            expr.paren, f"Expected {expected} arguments but got {len(expr.arguments)}"
+        )
+
+    def __bind_arguments(
+        self, expr: Call | Invoke, layout: FrameLayout, slot: int = 0
+    ) -> List[Any]:
+        """
+        Evaluate the call arguments straight into a recycled frame,
+        from its slot `slot` on
+        """
+
+        frames = layout.frames
+        frame = frames.pop() if frames else layout.allocate()
+
+        for argument in expr.arguments:
+            frame[slot] = argument.accept(self)
+            slot += 1
+
+        return frame
+
+    def __invoke_function(self, expr: Call, function: LoxFunction) -> Any:
+        """
+        Call a Lox function whose arity matches the call site
+        """
+
+        frame = self.__bind_arguments(expr, function.layout)
+
+        return self.call_function(function, frame, expr.paren)
+
+    def __invoke_method(self, expr: Call, callee: BoundMethod) -> Any:
+        """
+        Call a bound method whose arity matches the call site
+        """
+
+        return self.__call_method(expr, callee.receiver, callee.method)
+
+    def __invoke_callable(self, expr: Call, callee: LoxCallable) -> Any:
+        """
+        Call any callable value whose arity matches the call site
+        """
+
+        arguments = [argument.accept(self) for argument in expr.arguments]
 
-        if not isinstance(callee, LoxCallable):
+        call_site = self.call_site
+        self.call_site = expr.paren
+
+        try:
+            return callee(self, arguments)
+        except NativeError as error:
+            raise RuntimeErrorL(expr.paren, *error.args) from None
+        finally:
+            self.call_site = call_site
+
+    def __specialize(self, expr: Call, callee: Any) -> Any:
+        """
+        Return the invocation path of `callee` at a call site,
+        checking once that it is callable with that many arguments
+        """
+
+        if type(callee) is LoxFunction and not callee.generator:
+            arity = callee.layout.arity
+            invoke = self.__invoke_function
+        elif type(callee) is BoundMethod:
+            arity = callee.method.layout.arity
+            invoke = self.__invoke_method
+        elif isinstance(callee, LoxCallable):
+            arity = callee.arity()
+            invoke = self.__invoke_callable
+        else:
             raise RuntimeErrorL(expr.paren, "Can only call function and classes")
 
-        callee: LoxCallable = callee
+        count = len(expr.arguments)
+
+        if count != arity and not (callee.variadic and count > arity):
+            raise self.__arity_error(expr, arity, callee.variadic)
+
+        return invoke
 
-        arity = callee.arity()
-        arguments_size = len(expr.arguments)
+    def __call(self, expr: Call, callee: Any, key: Any) -> Any:
+        """
+        Call a callee missing from the inline cache of the call site,
+        its key is remembered until the cache is full
+        """
+
+        if not expr.hits and not expr.misses:
+            self.call_sites.append(expr)
+
+        expr.misses += 1
+
+        invoke = self.__specialize(expr, callee)
+
+        if len(expr.cache) < POLYMORPHIC_LIMIT:
+            expr.cache[key] = invoke
+
+        return invoke(expr, callee)
+
+    def __call_cached(self, expr: Call | Invoke, callee: Any) -> Any:
+        """
+        Call a callee through the inline cache of its call site
+        """
 
-        if arguments_size != arity:
+        try:
+            key = callee.key
+        except AttributeError:
             raise RuntimeErrorL(
-                expr.paren, f"Expected {arity} arguments but got {arguments_size}"
-            )
+                expr.paren, "Can only call function and classes"
+            ) from None
 
-        arguments = list(map(self.__evaluate, expr.arguments))
+        invoke = expr.cache.get(key)
 
-        return callee(self, arguments)
+        if invoke is not None:
+            expr.hits += 1
 
-    def visit_return_statement(self, statement: ReturnStatement) -> Any:
-        value = None
+            return invoke(expr, callee)
 
-        if statement.value is not None:
-            value = self.__evaluate(statement.value)
+        return self.__call(expr, callee, key)
+
+    def visit_call_expr(self, expr: Call) -> Any:
+        callee = expr.callee.accept(self)
+
+        # `__call_cached` inlined, every Lox call takes one Python frame less
+        try:
+            key = callee.key
+        except AttributeError:
+            raise RuntimeErrorL(
+                expr.paren, "Can only call function and classes"
+            ) from None
 
-        raise Return(value)
+        invoke = expr.cache.get(key)
 
-    def __stringify(self, obj: Any) -> str:
+        if invoke is not None:
+            expr.hits += 1
+
+            return invoke(expr, callee)
+
+        return self.__call(expr, callee, key)
+
+    def call_cache_stats(self) -> Dict[str, int]:
         """
-        Turns any value into a string
+        Return the inline cache statistics of the call sites run so far,
+        a site is megamorphic once a callee missed its full cache
         """
 
-        if obj is None:
-            return "nil"
+        stats = {
+            "sites": len(self.call_sites),
+            "hits": 0,
+            "misses": 0,
+            "monomorphic": 0,
+            "polymorphic": 0,
+            "megamorphic": 0,
+        }
+
+        for expr in self.call_sites:
+            stats["hits"] += expr.hits
+            stats["misses"] += expr.misses
+
+            if expr.misses > len(expr.cache):
+                stats["megamorphic"] += 1
+            elif len(expr.cache) == 1:
+                stats["monomorphic"] += 1
+            else:
+                stats["polymorphic"] += 1
+
+        return stats
+
+    def visit_return_statement(self, statement: ReturnStatement) -> Any:
+        value = None
+
+        if statement.tail_call:
+            expr = statement.value
+            callee = expr.callee.accept(self)
+
+            # A memoized tail call runs unmemoized in constant stack,
+            # the result of the call it completes is still memoized
+            if type(callee) is MemoizedFunction:
+                callee = callee.function
+
+            # The running `call_function` takes over the call
+            if type(callee) is LoxFunction and not callee.generator:
+                arity = callee.layout.arity
+
+                if len(expr.arguments) != arity:
+                    raise self.__arity_error(expr, arity)
+
+                frame = self.__bind_arguments(expr, callee.layout)
+                self.tail_call = (callee, frame, expr.paren)
 
-        return str(obj)
+                return TAIL_CALL
+
+            value = self.__call_cached(expr, callee)
+        elif statement.value is not None:
+            value = statement.value.accept(self)
+
+        self.__returned = value
+
+        return RETURN
 
     def runtime_error(error: RuntimeErrorL):
         """
@@ -265,20 +1038,76 @@ class Interpreter(Visitor):
 
         Error.had_runtime_error = True
 
-    def __execute(self, statement: Statement):
+    def __interpret(self, statements: List[Statement]):
         """
-        Evaluate a statement node
+        Interpret a list of statements on the current thread
         """
 
-        statement.accept(self)
-
-    def interpret(self, statements: List[Statement]):
-        """
-        Interpret a list of statements (node)
-        """
+        self.thread_id = get_ident()
 
         try:
             for statement in statements:
-                self.__execute(statement)
+                statement.accept(self)
         except RuntimeErrorL as error:
+            # The output printed before the error comes first
+            self.output.flush()
+
             Interpreter.runtime_error(error)
+        finally:
+            self.output.flush()
+
+    def __interpret_deep(self, statements: List[Statement]):
+        """
+        Interpret a list of statements on a thread whose recursion limit
+        holds `max_depth` nested calls of the deepest function of the
+        program, so only `max_depth` ends the calls. Every unit of the
+        recursion limit gets the C stack of the worst case unit, so no
+        program can overflow the thread stack.
+        An exception escaping the statements is raised again here
+        """
+
+        units = StackBudget(statements).units(self.max_depth)
+
+        errors: List[BaseException] = []
+
+        def run():
+            try:
+                self.__interpret(statements)
+            except BaseException as error:
+                errors.append(error)
+
+        try:
+            thread, limit = DEEP_THREADS.start(run, units)
+        except (RuntimeError, ValueError, OverflowError):
+            return self.__stack_error()
+
+        try:
+            thread.join()
+        finally:
+            DEEP_THREADS.finish(limit)
+
+        if errors:
+            raise errors[0]
+
+    def __stack_error(self):
+        """
+        Report a stack too large for the system
+        """
+
+        print(
+            f"Can't allocate the stack of {self.max_depth} nested calls",
+            file=stderr,
+        )
+
+        Error.had_runtime_error = True
+
+    def interpret(self, statements: List[Statement]):
+        """
+        Interpret a list of statements (node), on a dedicated thread
+        in deep mode
+        """
+
+        if self.deep:
+            self.__interpret_deep(statements)
+        else:
+            self.__interpret(statements)
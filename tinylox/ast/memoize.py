@@ -0,0 +1,88 @@
+"""memoize module"""
+
+from typing import Any, List
+from collections import OrderedDict
+
+from .callable import LoxCallable
+from .function import LoxFunction
+from ..error.error import NativeError
+
+# Default amount of results kept by a memoized function
+MEMO_SIZE = 1024
+
+# Marks a result missing from the cache, `nil` is a valid result
+MISSING = object()
+
+
+class MemoizedFunction(LoxCallable):
+    """
+    Lox function whose results are cached by arguments values,
+    the least recently used ones are evicted past `size` results
+    """
+
+    def __init__(self, function: LoxFunction, size: int = MEMO_SIZE):
+        self.function = function
+        self.size = size
+        self.results = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, interpreter: object, arguments: List[Any]) -> Any:
+        # `true == 1` in Python, the arguments types are part of the key
+        key = (*arguments, *map(type, arguments))
+        results = self.results
+
+        value = results.get(key, MISSING)
+
+        if value is not MISSING:
+            results.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+        self.misses += 1
+
+        value = self.function(interpreter, arguments)
+        results[key] = value
+
+        if len(results) > self.size:
+            results.popitem(last=False)
+            self.evictions += 1
+
+        return value
+
+    def arity(self) -> int:
+        return self.function.arity()
+
+    def __str__(self) -> str:
+        return str(self.function)
+
+
+class Memoize(LoxCallable):
+    """
+    Memoize native function, it returns a memoized version of
+    a Lox function, the caller vouches for the function purity
+    """
+
+    def __call__(self, interpreter: object, arguments: List[Any]) -> Any:
+        function = arguments[0]
+
+        if type(function) is MemoizedFunction:
+            return function
+
+        if type(function) is not LoxFunction:
+            raise NativeError("Can only memoize functions")
+
+        # Every call makes a new generator
+        if function.generator:
+            raise NativeError("Can't memoize a generator function")
+
+        return interpreter.memoize_function(function)
+
+    def arity(self) -> int:
+        return 1
+
+    def __str__(self) -> str:
+        return "<native function>"
@@ -0,0 +1,151 @@
+"""native function module"""
+
+from time import time
+from typing import Any, Callable, Dict, List, Sequence
+
+from .callable import LoxCallable
+from .operators import is_string
+from ..error.error import NativeError
+
+
+def check_number(value: Any) -> float:
+    """
+    Check if a value is a number
+    """
+
+    if type(value) is not float:
+        raise NativeError("Operand must be a number")
+
+    return value
+
+
+def check_index(value: Any, size: int) -> int:
+    """
+    Check if a value is an integer in `[0, size]`
+    """
+
+    check_number(value)
+
+    if not value.is_integer() or not 0 <= value <= size:
+        raise NativeError("Index out of range")
+
+    return int(value)
+
+
+def check_string(value: Any) -> str:
+    """
+    Check if a value is a string, a rope is flattened
+    """
+
+    if not is_string(value):
+        raise NativeError("Operand must be a string")
+
+    return str(value)
+
+
+def check_bool(value: Any) -> bool:
+    """
+    Check if a value is a boolean
+    """
+
+    if type(value) is not bool:
+        raise NativeError("Operand must be a boolean")
+
+    return value
+
+
+def check_callable(value: Any) -> LoxCallable:
+    """
+    Check if a value can be called
+    """
+
+    if not isinstance(value, LoxCallable):
+        raise NativeError("Operand must be a function")
+
+    return value
+
+
+# Argument checker of every type name a native signature can use,
+# "any" needs none, a checker may convert the value it accepts
+NATIVE_TYPES: Dict[str, Callable[[Any], Any] | None] = {
+    "any": None,
+    "number": check_number,
+    "string": check_string,
+    "bool": check_bool,
+    "function": check_callable,
+}
+
+
+def register_type(name: str, checker: Callable[[Any], Any]):
+    """
+    Make a value type usable in native signatures, `checker`
+    raises a `NativeError` for the values it rejects
+    """
+
+    NATIVE_TYPES[name] = checker
+
+
+class NativeFunction(LoxCallable):
+    """
+    Native function backed by a Python function, it receives
+    the Lox arguments checked by its signature as positional arguments.
+    A variadic native takes any amount of extra arguments,
+    they are checked with the last type of the signature
+    """
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable[..., Any],
+        arity: int,
+        signature: Sequence[str] = None,
+        variadic: bool = False,
+    ):
+        self.name = name
+        self.function = function
+        self.variadic = variadic
+        self.__arity = arity
+
+        if signature is None:
+            signature = ("any",) * (arity + variadic)
+
+        if len(signature) != arity + variadic:
+            raise ValueError(f"Signature of native {name} does not match its arity")
+
+        for kind in signature:
+            if kind not in NATIVE_TYPES:
+                raise ValueError(f"Unknown type {kind} in native {name} signature")
+
+        checkers = [NATIVE_TYPES[kind] for kind in signature]
+
+        # Looked up once, only the arguments needing a check are visited
+        self.checks = [
+            (index, check) for index, check in enumerate(checkers[:arity]) if check
+        ]
+        self.rest = checkers[-1] if variadic else None
+
+    def __call__(self, interpreter: object, arguments: List[Any]) -> Any:
+        for index, check in self.checks:
+            arguments[index] = check(arguments[index])
+
+        if self.rest is not None:
+            for index in range(self.__arity, len(arguments)):
+                arguments[index] = self.rest(arguments[index])
+
+        result = self.function(*arguments)
+
+        # Lox numbers are floats
+        if type(result) is int:
+            return float(result)
+
+        return result
+
+    def arity(self) -> int:
+        return self.__arity
+
+    def __str__(self) -> str:
+        return "<native function>"
+
+
+# Natives without a module of their own
+CORE_NATIVES = (NativeFunction("clock", time, 0),)
@@ -0,0 +1,181 @@
+"""operators module"""
+
+from typing import Any, Callable, Dict
+
+from ..error.error import RuntimeErrorL
+from ..scanner.token import Token, TokenKind
+from .rope import Rope, concat
+
+
+def is_truthy(obj: Any) -> bool:
+    """
+    Handle operation on a boolean `obj`
+    """
+
+    if obj is None:
+        return False
+
+    if type(obj) is bool:
+        return obj
+
+    return True
+
+
+def stringify(obj: Any) -> str:
+    """
+    Turns any value into a string
+    """
+
+    if obj is None:
+        return "nil"
+
+    return str(obj)
+
+
+def is_string(obj: Any) -> bool:
+    """
+    Check if a value is a Lox string, a `str` or a `Rope`
+    """
+
+    return type(obj) is str or type(obj) is Rope
+
+
+def is_equal(left: Any, right: Any) -> bool:
+    """
+    Lox equality, values of different types are never equal
+    (`true == 1` is true in Python), ropes are strings
+    """
+
+    # Interned strings, nil, booleans and functions
+    if left is right:
+        return True
+
+    if type(left) is type(right):
+        return left == right
+
+    return is_string(left) and is_string(right) and str(left) == str(right)
+
+
+def number_error(operator: Token) -> RuntimeErrorL:
+    """
+    Return the error of an operator expecting numbers
+    """
+
+    return RuntimeErrorL(operator, "Operand must be a number")
+
+
+def interning_add(
+    intern: Callable[[str], str] = None,
+) -> Callable[[Token, Any, Any], Any]:
+    """
+    Return the `add` handler, its flat string results go through `intern`
+    when one is given
+    """
+
+    def add(operator: Token, left: Any, right: Any) -> Any:
+        if type(left) is float and type(right) is float:
+            return left + right
+
+        if is_string(left) and is_string(right):
+            result = concat(left, right)
+
+            if intern is not None and type(result) is str:
+                return intern(result)
+
+            return result
+
+        raise RuntimeErrorL(operator, "Operands must be two numbers or two strings")
+
+    return add
+
+
+add = interning_add()
+
+
+def subtract(operator: Token, left: Any, right: Any) -> Any:
+    if type(left) is float and type(right) is float:
+        return left - right
+
+    raise number_error(operator)
+
+
+def multiply(operator: Token, left: Any, right: Any) -> Any:
+    if type(left) is float and type(right) is float:
+        return left * right
+
+    raise number_error(operator)
+
+
+def divide(operator: Token, left: Any, right: Any) -> Any:
+    if type(left) is float and type(right) is float:
+        return left / right
+
+    raise number_error(operator)
+
+
+def greater(operator: Token, left: Any, right: Any) -> Any:
+    if type(left) is float and type(right) is float:
+        return left > right
+
+    raise number_error(operator)
+
+
+def greater_equal(operator: Token, left: Any, right: Any) -> Any:
+    if type(left) is float and type(right) is float:
+        return left >= right
+
+    raise number_error(operator)
+
+
+def less(operator: Token, left: Any, right: Any) -> Any:
+    if type(left) is float and type(right) is float:
+        return left < right
+
+    raise number_error(operator)
+
+
+def less_equal(operator: Token, left: Any, right: Any) -> Any:
+    if type(left) is float and type(right) is float:
+        return left <= right
+
+    raise number_error(operator)
+
+
+def equal(_: Token, left: Any, right: Any) -> Any:
+    return is_equal(left, right)
+
+
+def not_equal(_: Token, left: Any, right: Any) -> Any:
+    return not is_equal(left, right)
+
+
+def negate(operator: Token, right: Any) -> Any:
+    if type(right) is float:
+        return -right
+
+    raise number_error(operator)
+
+
+def logical_not(_: Token, right: Any) -> Any:
+    return not is_truthy(right)
+
+
+# Handler of every binary operator, it checks its operands types
+BINARY: Dict[TokenKind, Callable[[Token, Any, Any], Any]] = {
+    TokenKind.PLUS: add,
+    TokenKind.MINUS: subtract,
+    TokenKind.STAR: multiply,
+    TokenKind.SLASH: divide,
+    TokenKind.GREATER: greater,
+    TokenKind.GREATER_EQUAL: greater_equal,
+    TokenKind.LESS: less,
+    TokenKind.LESS_EQUAL: less_equal,
+    TokenKind.EQUAL_EQUAL: equal,
+    TokenKind.BANG_EQUAL: not_equal,
+}
+
+# Handler of every unary operator
+UNARY: Dict[TokenKind, Callable[[Token, Any], Any]] = {
+    TokenKind.MINUS: negate,
+    TokenKind.BANG: logical_not,
+}
@@ -0,0 +1,76 @@
+"""output module"""
+
+import sys
+from typing import Self, TextIO
+from io import StringIO
+
+# Characters buffered before they are written to the stream
+BUFFER_SIZE = 1 << 16
+
+
+class Output:
+    """
+    Buffered output sink of the print statement, the buffer is
+    written to its stream past `size` characters, on `flush` and,
+    if `line_buffered`, on every line (the default for a terminal)
+    """
+
+    def __init__(
+        self,
+        stream: TextIO = None,
+        size: int = BUFFER_SIZE,
+        line_buffered: bool = None,
+    ):
+        # Looked up now so `contextlib.redirect_stdout` is honored
+        self.stream = sys.stdout if stream is None else stream
+        self.size = size
+
+        if line_buffered is None:
+            line_buffered = self.stream.isatty()
+
+        self.line_buffered = line_buffered
+
+        self.__lines = []
+        self.__buffered = 0
+
+    @classmethod
+    def memory(cls) -> Self:
+        """
+        Return a sink writing into an in-memory buffer, for embedding
+        """
+
+        return cls(StringIO(), line_buffered=False)
+
+    def write_line(self, line: str):
+        """
+        Buffer a line, the newline is added
+        """
+
+        self.__lines.append(line)
+        self.__buffered += len(line) + 1
+
+        if self.__buffered >= self.size or self.line_buffered:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered lines to the stream
+        """
+
+        if self.__lines:
+            self.__lines.append("")
+            self.stream.write("\n".join(self.__lines))
+
+            self.__lines.clear()
+            self.__buffered = 0
+
+        self.stream.flush()
+
+    def getvalue(self) -> str:
+        """
+        Return everything written to an in-memory sink
+        """
+
+        self.flush()
+
+        return self.stream.getvalue()
@@ -19,9 +19,25 @@ from ..ast.expr import (
     Call,
     FunctionStatement,
     ReturnStatement,
+    YieldStatement,
+    ClassStatement,
+    ForStatement,
+    Get,
+    Set,
+    Invoke,
+    This,
+    Super,
 )
 from ..error.error import ParserError, Error
 
+# Conditions of a counting for loop
+COMPARISONS = (
+    TokenKind.LESS,
+    TokenKind.LESS_EQUAL,
+    TokenKind.GREATER,
+    TokenKind.GREATER_EQUAL,
+)
+
 
 class Parser:
     """
@@ -157,6 +173,9 @@ class Parser:
             if type(expr) == Variable:
                 return Assign(expr.name, value)
 
+            if type(expr) == Get:
+                return Set(expr.object, expr.name, value)
+
             self.__error(equals, "Invalid assignment target")
 
         return expr
@@ -249,6 +268,10 @@ class Parser:
             TokenKind.RIGHT_PAREN, "Expect ')' after function arguments"
         )
 
+        # A method is called without being bound to its instance
+        if type(callee) == Get:
+            return Invoke(callee.object, callee.name, paren, arguments)
+
         return Call(callee, paren, arguments)
 
     def __call(self) -> Expr:
@@ -259,11 +282,16 @@ class Parser:
         expr = self.__primary()
 
         while True:
-            if not self.__match(TokenKind.LEFT_PAREN):
+            if self.__match(TokenKind.LEFT_PAREN):
+                expr = self.__finish_call(expr)
+            elif self.__match(TokenKind.DOT):
+                name = self.__consume(
+                    TokenKind.IDENTIFIER, "Expect property name after '.'"
+                )
+                expr = Get(expr, name)
+            else:
                 break
 
-            expr = self.__finish_call(expr)
-
         return expr
 
     def __unary(self) -> Expr:
@@ -303,6 +331,22 @@ class Parser:
 
             return Grouping(expr)
 
+        if self.__match(TokenKind.THIS):
+            return This(self.__peek_previous())
+
+        if self.__match(TokenKind.SUPER):
+            keyword = self.__peek_previous()
+
+            self.__consume(TokenKind.DOT, "Expect '.' after 'super'")
+            method = self.__consume(
+                TokenKind.IDENTIFIER, "Expect superclass method name"
+            )
+
+            # Read like the `super` and `this` variables
+            this = Token(TokenKind.THIS, "this", None, keyword.line)
+
+            return Super(keyword, method, Variable(keyword), This(this))
+
         if self.__match(TokenKind.IDENTIFIER):
             return Variable(self.__peek_previous())
 
@@ -336,6 +380,8 @@ class Parser:
                     pass
                 case TokenKind.RETURN:
                     return
+                case TokenKind.YIELD:
+                    return
 
             self.__advance()
 
@@ -411,6 +457,18 @@ class Parser:
 
         return WhileStatement(condition, body)
 
+    def __declares(self, statements: List[Statement]) -> bool:
+        """
+        Check if a list of statements declares a variable, a function
+        or a class
+        """
+
+        for statement in statements:
+            if type(statement) in (VarStatement, FunctionStatement, ClassStatement):
+                return True
+
+        return False
+
     def __for_statement(self) -> Statement:
         """
         For statement production
@@ -441,9 +499,16 @@ class Parser:
         self.__consume(TokenKind.RIGHT_PAREN, "Expect ')' after for")
 
         body = self.__statement()
+        statement = body
 
         if increment is not None:
-            body = BlockStatement([body, ExpressionStatement(increment)])
+            increment = ExpressionStatement(increment)
+
+            # A body declaring nothing can share the increment block
+            if type(body) == BlockStatement and not self.__declares(body.statements):
+                body = BlockStatement(body.statements + [increment])
+            else:
+                body = BlockStatement([body, increment])
 
         if condition is None:
             condition = Literal(True)
@@ -451,10 +516,78 @@ class Parser:
         body = WhileStatement(condition, body)
 
         if initializer is not None:
-            body = BlockStatement([ExpressionStatement(initializer), body])
+            body = BlockStatement([initializer, body])
+
+        step = self.__counting_step(initializer, condition, increment)
+
+        if step is not None:
+            return ForStatement(
+                initializer,
+                condition.operator,
+                condition.right,
+                step,
+                statement,
+                body,
+            )
 
         return body
 
+    def __counting_step(
+        self,
+        initializer: Statement | None,
+        condition: Expr,
+        increment: ExpressionStatement | None,
+    ) -> float | None:
+        """
+        Return the step of a for loop counting a number up to
+        a bound, like `for (var i = 0; i < n; i = i + 1)`,
+        `None` for any other loop
+        """
+
+        if type(initializer) != VarStatement or initializer.initializer is None:
+            return None
+
+        name = initializer.name.lexeme
+
+        if (
+            type(condition) != Binary
+            or condition.operator.kind not in COMPARISONS
+            or type(condition.left) != Variable
+            or condition.left.name.lexeme != name
+        ):
+            return None
+
+        # The bound is a number or another variable
+        limit = condition.right
+
+        if type(limit) == Literal:
+            if type(limit.value) is not float:
+                return None
+        elif type(limit) != Variable or limit.name.lexeme == name:
+            return None
+
+        if increment is None or type(increment.expression) != Assign:
+            return None
+
+        assign = increment.expression
+        value = assign.value
+
+        if (
+            assign.name.lexeme != name
+            or type(value) != Binary
+            or value.operator.kind not in (TokenKind.PLUS, TokenKind.MINUS)
+            or type(value.left) != Variable
+            or value.left.name.lexeme != name
+            or type(value.right) != Literal
+            or type(value.right.value) is not float
+        ):
+            return None
+
+        if value.operator.kind == TokenKind.MINUS:
+            return -value.right.value
+
+        return value.right.value
+
     def __return_statement(self) -> Statement:
         """
         Return statement production
@@ -470,6 +603,21 @@ class Parser:
 
         return ReturnStatement(keyword, value)
 
+    def __yield_statement(self) -> Statement:
+        """
+        Yield statement production
+        """
+
+        keyword = self.__peek_previous()
+        value = None
+
+        if not self.__check(TokenKind.SEMICOLON):
+            value = self.__expression()
+
+        self.__consume(TokenKind.SEMICOLON, "Expect ';' after yield value")
+
+        return YieldStatement(keyword, value)
+
     def __statement(self) -> Statement:
         """
         Statement production
@@ -493,6 +641,9 @@ class Parser:
         if self.__match(TokenKind.RETURN):
             return self.__return_statement()
 
+        if self.__match(TokenKind.YIELD):
+            return self.__yield_statement()
+
         return self.__expression_statement()
 
     def __var_declaration(self) -> Statement:
@@ -510,6 +661,27 @@ class Parser:
 
         return VarStatement(name, initializer)
 
+    def __class_declaration(self) -> Statement:
+        name = self.__consume(TokenKind.IDENTIFIER, "Expect class name")
+
+        superclass = None
+
+        if self.__match(TokenKind.LESS):
+            superclass = Variable(
+                self.__consume(TokenKind.IDENTIFIER, "Expect superclass name")
+            )
+
+        self.__consume(TokenKind.LEFT_BRACE, "Expect '{' before class body")
+
+        methods = []
+
+        while not self.__check(TokenKind.RIGHT_BRACE) and not self.__is_at_end():
+            methods.append(self.__function("method"))
+
+        self.__consume(TokenKind.RIGHT_BRACE, "Expect '}' after class body")
+
+        return ClassStatement(name, superclass, methods)
+
     def __function(self, kind: str) -> Statement:
         name = self.__consume(TokenKind.IDENTIFIER, f"Expect {kind} name")
 
@@ -546,6 +718,9 @@ class Parser:
             if self.__match(TokenKind.VAR):
                 return self.__var_declaration()
 
+            if self.__match(TokenKind.CLASS):
+                return self.__class_declaration()
+
             if self.__match(TokenKind.FUN):
                 return self.__function("function")
 
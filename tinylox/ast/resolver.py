@@ -1,10 +1,10 @@
 """resolver module"""
 
-from typing import Any, List
+from typing import Any, Dict, List, Self, Tuple
 from enum import Enum
 
 from .interpreter import Interpreter
-from ..scanner.token import Token
+from ..scanner.token import Token, TokenKind
 from .expr import (
     Visitor,
     Statement,
@@ -18,32 +18,177 @@ from .expr import (
     IfStatement,
     PrintStatement,
     ReturnStatement,
+    YieldStatement,
     WhileStatement,
+    ForStatement,
     Binary,
     Call,
     Grouping,
     Literal,
     Logical,
     Unary,
+    ClassStatement,
+    Get,
+    Set,
+    Invoke,
+    This,
+    Super,
 )
+from .frame import VariableKind, FrameLayout
 from ..error.error import Error
 
 
 class FunctionKind(Enum):
     NONE = "None"
     FUNCTION = "Function"
+    METHOD = "Method"
+    INITIALIZER = "Initializer"
+
+
+class ClassKind(Enum):
+    NONE = "None"
+    CLASS = "Class"
+    SUBCLASS = "Subclass"
+
+
+class Local:
+    """
+    Local variable declared in a scope
+    """
+
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.defined = False
+        self.captured = False
+        # Nodes reading, writing or declaring the variable from its own function
+        self.nodes = []
+        # Counted for loops bounded by the variable, they run natively
+        # only if no closure captures it by the end of its scope
+        self.loops: List[ForStatement] = []
+
+
+class FunctionScope:
+    """
+    Frame layout of a function being resolved
+    """
+
+    def __init__(self, enclosing: Self = None):
+        self.enclosing = enclosing
+        self.scopes = []
+
+        self.slots = 0
+        self.frame_size = 0
+
+        self.upvalues = []
+
+        # Purity of the function, it also needs the globals it reads
+        # to be pure functions
+        self.pure = True
+        self.globals = set()
+
+        # Yield statements resolved so far, a function yielding
+        # a value is a generator and can't return a value
+        self.yields = 0
+        self.returns: List[ReturnStatement] = []
+
+    def find_local(self, name: str) -> Local | None:
+        """
+        Return the innermost local named `name`
+        """
+
+        for scope in reversed(self.scopes):
+            local = scope.get(name)
+
+            if local is not None:
+                return local
+
+        return None
+
+    def add_upvalue(self, is_local: bool, index: int) -> int:
+        """
+        Register a captured variable and return its upvalue index
+        """
+
+        upvalue = (is_local, index)
+
+        if upvalue in self.upvalues:
+            return self.upvalues.index(upvalue)
+
+        self.upvalues.append(upvalue)
+
+        return len(self.upvalues) - 1
 
 
 class Resolver(Visitor):
     """
-    AST variable resolution
+    AST variable resolution, it assigns a frame slot to every local
+    and an upvalue to every variable captured by a closure
     """
 
     def __init__(self, interpreter: Interpreter):
         self.__interpreter = interpreter
-        self.__scopes = []
+        self.__function = FunctionScope()
 
         self.__current_function = FunctionKind.NONE
+        self.__current_class = ClassKind.NONE
+
+        # Global functions never redefined nor assigned, `None` otherwise
+        self.__global_functions: Dict[str, FunctionStatement | None] = {}
+        # Functions pure on their own with the globals they read,
+        # by declaration identity since the nodes are not hashable
+        self.__pure_candidates: Dict[int, Tuple[FunctionStatement, FunctionScope]] = {}
+
+    def resolve(self, statements: List[Statement]):
+        """
+        Resolve a whole program
+        """
+
+        self.resolve_statements(statements)
+
+        self.__interpreter.resolve_frame_size(self.__function.frame_size)
+
+        self.__resolve_purity()
+
+    def __resolve_purity(self):
+        """
+        Mark the pure functions, they have no side effect and only
+        call pure functions, recursive ones included
+        """
+
+        candidates = self.__pure_candidates
+        changed = True
+
+        while changed:
+            changed = False
+
+            for key, (_, function) in list(candidates.items()):
+                if any(
+                    id(self.__global_functions.get(name)) not in candidates
+                    for name in function.globals
+                ):
+                    del candidates[key]
+                    changed = True
+
+        for statement, _ in candidates.values():
+            statement.pure = True
+
+    def __impure(self):
+        """
+        The function being resolved has a side effect
+        """
+
+        self.__function.pure = False
+
+    def __declare_global(self, name: Token, statement: FunctionStatement = None):
+        """
+        Track a global declaration, only the global functions
+        declared once and never assigned can be called by pure functions
+        """
+
+        if statement is None or name.lexeme in self.__global_functions:
+            self.__global_functions[name.lexeme] = None
+        else:
+            self.__global_functions[name.lexeme] = statement
 
     def resolve_expression(self, expr: Expr):
         """
@@ -72,66 +217,155 @@ class Resolver(Visitor):
         Add a scope to the stack
         """
 
-        self.__scopes.append({})
+        self.__function.scopes.append({})
 
     def __end_scope(self):
         """
-        Remove a scope from the stack
+        Remove a scope from the stack, its variables are now fully
+        known so every node using them gets its variable kind
         """
 
-        self.__scopes.pop()
+        function = self.__function
+        scope = function.scopes.pop()
+
+        for local in scope.values():
+            kind = VariableKind.CELL if local.captured else VariableKind.LOCAL
+
+            for node in local.nodes:
+                node.kind = kind
+
+            # A closure may change a captured bound while its loops run
+            if local.captured:
+                for loop in local.loops:
+                    loop.counted = False
+
+        # Slots of a closed scope are reused by the next ones
+        function.slots -= len(scope)
 
     def visit_block_statement(self, statement: BlockStatement) -> Any:
+        yields = self.__function.yields
+
         self.__begin_scope()
         self.resolve_statements(statement.statements)
         self.__end_scope()
 
-    def __declare(self, name: Token):
+        statement.yields = self.__function.yields != yields
+
+    def __declare(self, name: Token, node: Any = None) -> Local | None:
         """
-        Set the identifier to the "declared" state
+        Set the identifier to the "declared" state, `node` is
+        the declaration node that will receive the variable kind
         """
 
-        if not self.__scopes:
-            return
+        function = self.__function
 
-        if name.lexeme in self.__scopes[-1].keys():
+        if not function.scopes:
+            self.__declare_global(
+                name, node if type(node) is FunctionStatement else None
+            )
+
+            return None
+
+        scope = function.scopes[-1]
+
+        if name.lexeme in scope.keys():
             Error.error_token(name, "Already a variable with this name in this scope")
 
-        self.__scopes[-1][name.lexeme] = False
+        local = Local(function.slots)
+
+        function.slots += 1
+        function.frame_size = max(function.frame_size, function.slots)
+
+        if node is not None:
+            node.slot = local.slot
+            local.nodes.append(node)
+
+        scope[name.lexeme] = local
+
+        return local
 
     def __define(self, name: Token):
         """
         Set the identifier to the "defined" state
         """
 
-        if not self.__scopes:
+        function = self.__function
+
+        if not function.scopes:
             return
 
-        self.__scopes[-1][name.lexeme] = True
+        function.scopes[-1][name.lexeme].defined = True
 
-    def __resolve_expression_local(self, expr: Expr, name: Token):
+    def __resolve_upvalue(self, function: FunctionScope, name: str) -> int | None:
         """
-        If None is returned, the variable is inside the global scope,
-        else, it returns the scope position
+        Look for `name` in the functions enclosing `function`,
+        if it is found, it returns the upvalue index in `function`
         """
 
-        scopes = self.__scopes[::-1]
+        enclosing = function.enclosing
+
+        if enclosing is None:
+            return None
+
+        local = enclosing.find_local(name)
 
-        for i, scope in enumerate(scopes):
-            if name.lexeme in scope.keys():
-                self.__interpreter.resolve_expr(expr, i)
-                return
+        if local is not None:
+            local.captured = True
+
+            return function.add_upvalue(True, local.slot)
+
+        index = self.__resolve_upvalue(enclosing, name)
+
+        if index is None:
+            return None
+
+        return function.add_upvalue(False, index)
+
+    def __resolve_expression_local(
+        self, expr: Variable | Assign | This, name: Token
+    ) -> VariableKind:
+        """
+        Set where the variable `name` used by `expr` lives,
+        a variable that is not found is a global one.
+        It returns `VariableKind.LOCAL` for any variable of the current frame
+        """
+
+        local = self.__function.find_local(name.lexeme)
+
+        if local is not None:
+            expr.slot = local.slot
+            local.nodes.append(expr)
+            return VariableKind.LOCAL
+
+        index = self.__resolve_upvalue(self.__function, name.lexeme)
+
+        if index is not None:
+            expr.kind = VariableKind.UPVALUE
+            expr.slot = index
+            return VariableKind.UPVALUE
+
+        return VariableKind.GLOBAL
 
     def visit_variable_expr(self, expr: Variable) -> Any:
-        if self.__scopes and not self.__scopes[-1].get(expr.name.lexeme):
-            Error.error_token(
-                expr.name, "Can't read local variable in its own initializer"
-            )
+        scopes = self.__function.scopes
+
+        if scopes:
+            local = scopes[-1].get(expr.name.lexeme)
 
-        self.__resolve_expression_local(expr, expr.name)
+            if local is not None and not local.defined:
+                Error.error_token(
+                    expr.name, "Can't read local variable in its own initializer"
+                )
+
+        match self.__resolve_expression_local(expr, expr.name):
+            # A captured variable may be assigned by another function
+            case VariableKind.UPVALUE:
+                self.__impure()
+            case VariableKind.GLOBAL:
+                self.__function.globals.add(expr.name.lexeme)
 
     def visit_var_statement(self, statement: VarStatement) -> Any:
-        self.__declare(statement.name)
+        self.__declare(statement.name, statement)
 
         if statement.initializer is not None:
             self.resolve_expression(statement.initializer)
@@ -140,64 +374,242 @@ class Resolver(Visitor):
 
     def visit_assign_expr(self, expr: Assign) -> Any:
         self.resolve_expression(expr.value)
-        self.__resolve_expression_local(expr, expr.name)
+
+        kind = self.__resolve_expression_local(expr, expr.name)
+
+        if kind != VariableKind.LOCAL:
+            self.__impure()
+
+        if kind == VariableKind.GLOBAL:
+            self.__declare_global(expr.name)
 
     def __resolve_function(self, statement: FunctionStatement, kind: FunctionKind):
         """
-        Resolve a function
+        Resolve a function, its parameters take the first slots of its frame,
+        after the instance for a method
         """
 
         enclosing_function = self.__current_function
         self.__current_function = kind
 
+        function = FunctionScope(self.__function)
+        self.__function = function
+
         self.__begin_scope()
 
+        receiver = []
+
+        if kind in (FunctionKind.METHOD, FunctionKind.INITIALIZER):
+            this = Token(TokenKind.THIS, "this", None, statement.name.line)
+
+            receiver.append(self.__declare(this))
+            self.__define(this)
+
+        parameters = [self.__declare(parameter) for parameter in statement.parameters]
+
         for parameter in statement.parameters:
-            self.__declare(parameter)
             self.__define(parameter)
 
         self.resolve_statements(statement.body)
 
         self.__end_scope()
 
+        statement.generator = function.yields > 0
+
+        if statement.generator:
+            for returned in function.returns:
+                Error.error_token(
+                    returned.keyword, "Can't return a value from a generator"
+                )
+
+        statement.layout = FrameLayout(
+            len(parameters),
+            function.frame_size,
+            [local.slot for local in receiver + parameters if local.captured],
+            function.upvalues,
+        )
+
+        if function.pure:
+            self.__pure_candidates[id(statement)] = (statement, function)
+
+        self.__function = function.enclosing
         self.__current_function = enclosing_function
 
     def visit_function_statement(self, statement: FunctionStatement) -> Any:
-        self.__declare(statement.name)
+        # Every evaluation makes a new closure
+        self.__impure()
+
+        self.__declare(statement.name, statement)
         self.__define(statement.name)
         self.__resolve_function(statement, FunctionKind.FUNCTION)
 
+    def visit_class_statement(self, statement: ClassStatement) -> Any:
+        # Every evaluation makes a new class
+        self.__impure()
+
+        enclosing_class = self.__current_class
+        self.__current_class = ClassKind.CLASS
+
+        self.__declare(statement.name, statement)
+        self.__define(statement.name)
+
+        superclass = statement.superclass
+
+        if superclass is not None:
+            if superclass.name.lexeme == statement.name.lexeme:
+                Error.error_token(superclass.name, "A class can't inherit from itself")
+
+            self.__current_class = ClassKind.SUBCLASS
+            self.resolve_expression(superclass)
+
+            # The methods capture `super` from a scope around them
+            self.__begin_scope()
+
+            keyword = Token(TokenKind.SUPER, "super", None, statement.name.line)
+            statement.super_declaration = VarStatement(keyword, None)
+
+            self.__declare(keyword, statement.super_declaration)
+            self.__define(keyword)
+
+        for method in statement.methods:
+            kind = FunctionKind.METHOD
+
+            if method.name.lexeme == "init":
+                kind = FunctionKind.INITIALIZER
+
+            self.__resolve_function(method, kind)
+
+        if superclass is not None:
+            self.__end_scope()
+
+        self.__current_class = enclosing_class
+
     def visit_expression_statement(self, expr: ExpressionStatement) -> Any:
         self.resolve_expression(expr.expression)
 
     def visit_if_statement(self, statement: IfStatement) -> Any:
+        yields = self.__function.yields
+
         self.resolve_expression(statement.condition)
         self.resolve_statement(statement.then_branch)
 
         if statement.else_branch is not None:
             self.resolve_statement(statement.else_branch)
 
+        statement.yields = self.__function.yields != yields
+
     def visit_print_statement(self, statement: PrintStatement) -> Any:
+        self.__impure()
+
         self.resolve_expression(statement.expression)
 
     def visit_return_statement(self, statement: ReturnStatement) -> Any:
-        if self.__current_function != FunctionKind.FUNCTION:
+        if self.__current_function == FunctionKind.NONE:
             Error.error_token(statement.keyword, "Can't return from a top-level code")
 
+        if (
+            self.__current_function == FunctionKind.INITIALIZER
+            and statement.value is not None
+        ):
+            Error.error_token(
+                statement.keyword, "Can't return a value from an initializer"
+            )
+
+        if statement.value is not None:
+            self.__function.returns.append(statement)
+            self.resolve_expression(statement.value)
+
+        # The call is the last thing the function does
+        statement.tail_call = type(statement.value) == Call
+
+    def visit_yield_statement(self, statement: YieldStatement) -> Any:
+        if self.__current_function == FunctionKind.NONE:
+            Error.error_token(statement.keyword, "Can't yield from a top-level code")
+
+        if self.__current_function == FunctionKind.INITIALIZER:
+            Error.error_token(statement.keyword, "Can't yield from an initializer")
+
+        # The caller decides when the function runs
+        self.__impure()
+        self.__function.yields += 1
+
         if statement.value is not None:
             self.resolve_expression(statement.value)
 
     def visit_while_statement(self, statement: WhileStatement) -> Any:
+        yields = self.__function.yields
+
         self.resolve_expression(statement.condition)
         self.resolve_statement(statement.body)
 
+        statement.yields = self.__function.yields != yields
+
+    def visit_for_statement(self, statement: ForStatement) -> Any:
+        function = self.__function
+        yields = function.yields
+
+        # Local variable bounding the loop and the nodes using it so far
+        limit = statement.limit
+        bound = None
+
+        if type(limit) is Variable:
+            bound = function.find_local(limit.name.lexeme)
+
+        used = len(bound.nodes) if bound is not None else 0
+
+        # The generic loop, the counter is declared in its block scope
+        loop = statement.loop
+
+        self.__begin_scope()
+        self.resolve_statements(loop.statements)
+
+        counter = function.scopes[-1][statement.initializer.name.lexeme]
+
+        self.__end_scope()
+
+        statement.yields = loop.yields = function.yields != yields
+
+        # The loop can run natively while it only sees the values
+        # of its own counter and a bound that does not change
+        counter_assigned = [node for node in counter.nodes if type(node) is Assign]
+
+        if bound is not None:
+            constant = not any(type(node) is Assign for node in bound.nodes[used:])
+        else:
+            constant = type(limit) is Literal
+
+        statement.counted = (
+            constant
+            and not statement.yields
+            and not counter.captured
+            and len(counter_assigned) == 1
+        )
+
+        # Whether a closure captures the bound is known once its scope is over
+        if statement.counted and bound is not None:
+            bound.loops.append(statement)
+
     def visit_binary_expr(self, expr: Binary) -> Any:
+        expr.handler = self.__interpreter.binary[expr.operator.kind]
+
         self.resolve_expression(expr.left)
         self.resolve_expression(expr.right)
 
     def visit_call_expr(self, expr: Call) -> Any:
+        # Inline cache of the call site, filled by the interpreter
+        expr.cache = {}
+
         self.resolve_expression(expr.callee)
 
+        # Only global functions can be proven pure, a captured
+        # variable already made the function impure
+        callee = expr.callee
+
+        if type(callee) is not Variable:
+            self.__impure()
+        elif self.__function.find_local(callee.name.lexeme) is not None:
+            self.__impure()
+
         for argument in expr.arguments:
             self.resolve_expression(argument)
 
@@ -205,11 +617,59 @@ class Resolver(Visitor):
         self.resolve_expression(expr.expression)
 
     def visit_literal_expr(self, expr: Literal) -> Any:
-        return None
+        # Equal literals are the same string object
+        if type(expr.value) is str:
+            expr.value = self.__interpreter.strings.intern(expr.value)
 
     def visit_logical_expr(self, expr: Logical) -> Any:
         self.resolve_expression(expr.left)
         self.resolve_expression(expr.right)
 
     def visit_unary_expr(self, expr: Unary) -> Any:
+        expr.handler = self.__interpreter.unary[expr.operator.kind]
+
         self.resolve_expression(expr.right)
+
+    def visit_get_expr(self, expr: Get) -> Any:
+        # Fields can be assigned by any function
+        self.__impure()
+
+        self.resolve_expression(expr.object)
+
+    def visit_set_expr(self, expr: Set) -> Any:
+        self.__impure()
+
+        self.resolve_expression(expr.value)
+        self.resolve_expression(expr.object)
+
+    def visit_invoke_expr(self, expr: Invoke) -> Any:
+        # Inline cache of a callable field, filled by the interpreter
+        expr.cache = {}
+
+        self.__impure()
+
+        self.resolve_expression(expr.object)
+
+        for argument in expr.arguments:
+            self.resolve_expression(argument)
+
+    def visit_this_expr(self, expr: This) -> Any:
+        if self.__current_class == ClassKind.NONE:
+            Error.error_token(expr.keyword, "Can't use 'this' outside of a class")
+            return
+
+        self.__resolve_expression_local(expr, expr.keyword)
+
+    def visit_super_expr(self, expr: Super) -> Any:
+        if self.__current_class == ClassKind.NONE:
+            Error.error_token(expr.keyword, "Can't use 'super' outside of a class")
+            return
+
+        if self.__current_class != ClassKind.SUBCLASS:
+            Error.error_token(
+                expr.keyword, "Can't use 'super' in a class with no superclass"
+            )
+            return
+
+        self.resolve_expression(expr.superclass)
+        self.resolve_expression(expr.instance)
@@ -0,0 +1,77 @@
+"""rope module"""
+
+from typing import Any, List
+
+# Concatenations shorter than this are plain strings
+ROPE_SIZE = 256
+
+
+class Rope:
+    """
+    Lazy string concatenation, the chunks are joined on the first
+    observation (print, equality, length, hash).
+    Ropes appended to the same chunks share the list, only the one
+    holding its whole content extends it in place
+    """
+
+    __slots__ = ("chunks", "count", "length", "flat")
+
+    def __init__(self, chunks: List[str], length: int):
+        self.chunks = chunks
+        # Amount of the shared chunks that belong to this rope
+        self.count = len(chunks)
+        self.length = length
+        self.flat = None
+
+    def append(self, piece: str) -> "Rope":
+        """
+        Return a new rope ending with `piece`
+        """
+
+        if self.flat is not None:
+            # The joined string releases the chunks
+            chunks = [self.flat]
+        elif len(self.chunks) != self.count:
+            chunks = self.chunks[: self.count]
+        else:
+            chunks = self.chunks
+
+        chunks.append(piece)
+
+        return Rope(chunks, self.length + len(piece))
+
+    def __str__(self) -> str:
+        if self.flat is None:
+            self.flat = "".join(self.chunks[: self.count])
+            self.chunks = None
+
+        return self.flat
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not str and type(other) is not Rope:
+            return False
+
+        return self.length == len(other) and str(self) == str(other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
+def concat(left: str | Rope, right: str | Rope) -> str | Rope:
+    """
+    Concatenate two strings, appending to a rope is amortized O(1)
+    """
+
+    if type(right) is Rope:
+        right = str(right)
+
+    if type(left) is Rope:
+        return left.append(right)
+
+    if len(left) + len(right) < ROPE_SIZE:
+        return left + right
+
+    return Rope([left, right], len(left) + len(right))
@@ -0,0 +1,169 @@
+"""stack budget module"""
+
+from dataclasses import fields
+from sys import getrecursionlimit, setrecursionlimit
+from threading import Lock, Thread, stack_size
+from typing import Callable, Dict, List, Tuple
+
+from .expr import Call, Expr, FunctionStatement, Invoke, ReturnStatement, Statement
+
+# Recursion units, Python frames and C re-entries counted by the
+# recursion limit, from a node to the nodes it evaluates
+NODE_UNITS = 2
+
+# A call evaluates its arguments under its whole invocation path
+CALL_UNITS = {
+    Call: 7,
+    Invoke: 7,
+    ReturnStatement: 7,
+}
+
+# From the invocation of a callee to its first statement, through
+# a native, a memoized function, a class or a generator resume
+ENTRY_UNITS = 16
+
+# C stack used by a recursion unit, a unit of a CPython 3.11 C re-entry
+# (`__call__`, `next`, `yield from`) takes about 420 bytes
+STACK_BYTES_PER_UNIT = 1024
+
+
+def children(node: Expr | Statement) -> List[Expr | Statement]:
+    """
+    Return the nodes a node holds
+    """
+
+    nodes = []
+
+    for member in fields(node):
+        value = getattr(node, member.name)
+
+        for child in value if type(value) is list else (value,):
+            if isinstance(child, (Expr, Statement)):
+                nodes.append(child)
+
+    return nodes
+
+
+class StackBudget:
+    """
+    Worst case recursion units taken by a program, the units of its
+    top-level statements and the units of a single Lox call, from
+    its call site in the deepest function to its callee first statement
+    """
+
+    def __init__(self, statements: List[Statement]):
+        # Height of every node walked, a node shared by several
+        # parents is walked once
+        self.__heights: Dict[int, int] = {}
+        self.__body = 0
+
+        self.top = self.__height_of(statements)
+        self.call = ENTRY_UNITS + self.__body
+
+    def __height_of(self, statements: List[Statement]) -> int:
+        """
+        Return the units of the deepest statement of a sequence,
+        the nodes are walked without recursion so any nesting is measured.
+        A function body is measured on its own as it runs in a call
+        """
+
+        heights = self.__heights
+
+        # Nodes to measure, with their children once they are pushed,
+        # a node is measured once its children are
+        pending = [(statement, None) for statement in statements]
+
+        while pending:
+            node, nodes = pending.pop()
+
+            if id(node) in heights:
+                continue
+
+            function = type(node) is FunctionStatement
+
+            if nodes is None:
+                nodes = node.body if function else children(node)
+
+                pending.append((node, nodes))
+                pending.extend((child, None) for child in nodes)
+
+                continue
+
+            height = max((heights[id(child)] for child in nodes), default=0)
+
+            if function:
+                self.__body = max(self.__body, height)
+                heights[id(node)] = NODE_UNITS
+            else:
+                heights[id(node)] = CALL_UNITS.get(type(node), NODE_UNITS) + height
+
+        return max((heights[id(statement)] for statement in statements), default=0)
+
+    def units(self, max_depth: int) -> int:
+        """
+        Return the units of `max_depth` nested calls
+        """
+
+        return self.top + max_depth * self.call
+
+
+class DeepThreads:
+    """
+    Threads running programs in deep mode. The recursion limit and the
+    thread stack size are process wide, so they only change under a lock:
+    the limit is raised to the highest one the running threads need,
+    and restored once none of them runs. The other threads see the raised
+    limit meanwhile, only the deep mode threads have the stack for it
+    """
+
+    def __init__(self):
+        self.__lock = Lock()
+        # Limit outside of the threads, and the limits of the running ones
+        self.__base = getrecursionlimit()
+        self.__limits: List[int] = []
+
+    def start(self, target: Callable[[], None], units: int) -> Tuple[Thread, int]:
+        """
+        Start a thread running `target` with `units` more recursion units
+        than outside of the threads, each with the stack of the worst
+        case unit. The thread and its limit, for `finish`, are returned
+        """
+
+        with self.__lock:
+            limits = self.__limits
+
+            if not limits:
+                self.__base = getrecursionlimit()
+
+            limit = self.__base + units
+            size = stack_size()
+
+            setrecursionlimit(max([limit, *limits]))
+
+            try:
+                stack_size(max(size, limit * STACK_BYTES_PER_UNIT))
+
+                thread = Thread(target=target)
+                thread.start()
+            except BaseException:
+                setrecursionlimit(max([self.__base, *limits]))
+                raise
+            finally:
+                stack_size(size)
+
+            limits.append(limit)
+
+        return thread, limit
+
+    def finish(self, limit: int):
+        """
+        Give back the limit of a thread over
+        """
+
+        with self.__lock:
+            self.__limits.remove(limit)
+
+            setrecursionlimit(max([self.__base, *self.__limits]))
+
+
+DEEP_THREADS = DeepThreads()
@@ -0,0 +1,72 @@
+"""string natives module"""
+
+import re
+from typing import Any
+
+from .native import NativeFunction, check_index, check_string
+from .collection import LoxList
+from .operators import is_string, stringify
+from ..error.error import NativeError
+
+# Strings `to_number` accepts, like the number literals with an optional sign
+NUMBER = re.compile(r"-?[0-9]+(\.[0-9]+)?")
+
+
+def length(s: str) -> float:
+    if not is_string(s):
+        raise NativeError("Operand must be a string")
+
+    # A rope knows its length without being flattened
+    return float(len(s))
+
+
+def substring(s: str, start: float, end: float) -> str:
+    end = check_index(end, len(s))
+
+    return s[check_index(start, end) : end]
+
+
+def find(s: str, sub: str) -> float:
+    return float(s.find(sub))
+
+
+def split(s: str, separator: str) -> LoxList:
+    # An empty separator splits every character
+    if not separator:
+        return LoxList(list(s))
+
+    return LoxList(s.split(separator))
+
+
+def join(a: LoxList, separator: str) -> str:
+    return separator.join(map(check_string, a.values))
+
+
+def replace(s: str, old: str, new: str) -> str:
+    return s.replace(old, new)
+
+
+def to_number(s: str) -> float | None:
+    # Not a number reads as nil
+    if NUMBER.fullmatch(s) is None:
+        return None
+
+    return float(s)
+
+
+def to_string(value: Any) -> str:
+    return stringify(value)
+
+
+# String natives defined in the global environment
+STRING_NATIVES = (
+    # Not flattening a rope, the length checks its argument
+    NativeFunction("str_length", length, 1),
+    NativeFunction("str_sub", substring, 3, ("string", "number", "number")),
+    NativeFunction("str_find", find, 2, ("string", "string")),
+    NativeFunction("str_split", split, 2, ("string", "string")),
+    NativeFunction("str_join", join, 2, ("list", "string")),
+    NativeFunction("str_replace", replace, 3, ("string", "string", "string")),
+    NativeFunction("to_number", to_number, 1, ("string",)),
+    NativeFunction("to_string", to_string, 1),
+)
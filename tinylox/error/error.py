@@ -30,6 +30,15 @@ class RuntimeErrorL(Exception):
         return self.__token
 
 
+class NativeError(Exception):
+    """
+    Exception for the native functions, the interpreter
+    turns it into a runtime error at the call site
+    """
+
+    pass
+
+
 class Error:
     """
     It manages the Lox workflow
@@ -1,9 +1,18 @@
 """lox module"""
 
+from contextlib import ExitStack, contextmanager
+from typing import Iterator
+
 from .scanner.scanner import Scanner
 from .ast.parser import Parser
 from .ast.interpreter import Interpreter
+from .ast.resolver import Resolver
 from .error.error import Error
+from .profiler.sampler import Sampler
+from .profiler.host import HostProfiler
+from .profiler.stats import StatsInterpreter
+from .profiler.timings import Timings, count_nodes
+from .profiler.memory import MemoryProfiler
 
 PROMPT_PREFIX = "> "
 
@@ -13,35 +22,141 @@ class Lox:
     Lox interpreter entry point
     """
 
-    def __interpret(source: str):
+    @contextmanager
+    def __phase(
+        name: str, timings: Timings | None, memory: MemoryProfiler | None
+    ) -> Iterator[None]:
+        """
+        Run a phase under the recorders given
+        """
+
+        with ExitStack() as stack:
+            # The memory profile leaves the timings out
+            if memory is not None:
+                stack.enter_context(memory.phase(name))
+
+            if timings is not None:
+                stack.enter_context(timings.phase(name))
+
+            yield
+
+    def __interpret(
+        source: str,
+        max_depth: int = None,
+        memoize: bool = False,
+        sampler: Sampler = None,
+        host_profiler: HostProfiler = None,
+        stats: bool = False,
+        timings: Timings = None,
+        memory: MemoryProfiler = None,
+    ) -> Interpreter | None:
+        """
+        Interpret from a source string, `max_depth` runs it in
+        deep mode with that many nested Lox calls,
+        `memoize` caches the results of the pure functions,
+        a `sampler` profiles the Lox call stack while the program runs,
+        a `host_profiler` profiles the Python functions of every phase,
+        `stats` counts what the program does with a `StatsInterpreter`,
+        `timings` records the time taken by every phase,
+        `memory` records the memory allocated by every phase.
+        The interpreter is returned, `None` if the program has errors
+        """
+
+        if host_profiler is not None:
+            host_profiler.start()
+
+        try:
+            return Lox.__run(
+                source, max_depth, memoize, sampler, stats, timings, memory
+            )
+        finally:
+            if host_profiler is not None:
+                host_profiler.stop()
+
+    def __run(
+        source: str,
+        max_depth: int,
+        memoize: bool,
+        sampler: Sampler,
+        stats: bool,
+        timings: Timings,
+        memory: MemoryProfiler,
+    ) -> Interpreter | None:
         """
-        Interpret from a source string
+        Scan, parse, resolve and interpret a source string
         """
 
-        scanner = Scanner(source)
-        tokens = scanner.scan_tokens()
+        with Lox.__phase("scan", timings, memory):
+            scanner = Scanner(source)
+            tokens = scanner.scan_tokens()
+
+        if timings is not None:
+            timings.count("tokens", len(tokens))
 
-        parser = Parser(tokens)
-        statements = parser.parse()
+        with Lox.__phase("parse", timings, memory):
+            parser = Parser(tokens)
+            statements = parser.parse()
 
         if Error.had_error:
             return
 
-        interpreter = Interpreter()
-        interpreter.interpret(statements)
+        if timings is not None:
+            timings.count("nodes", count_nodes(statements))
+
+        interpreter_class = StatsInterpreter if stats else Interpreter
 
-        if Error.had_runtime_error:
+        # The resolver gives its results to the interpreter
+        with Lox.__phase("resolve", timings, memory):
+            interpreter = interpreter_class(max_depth, memoize=memoize)
+
+            resolver = Resolver(interpreter)
+            resolver.resolve(statements)
+
+        if Error.had_error:
             return
 
-    def interpret_from_file(path: str):
+        if sampler is not None:
+            sampler.start(interpreter)
+
+        try:
+            with Lox.__phase("interpret", timings, memory):
+                interpreter.interpret(statements)
+        finally:
+            if sampler is not None:
+                sampler.stop()
+
+        return interpreter
+
+    def interpret_from_file(
+        path: str,
+        max_depth: int = None,
+        memoize: bool = False,
+        sampler: Sampler = None,
+        host_profiler: HostProfiler = None,
+        stats: bool = False,
+        timings: Timings = None,
+        memory: MemoryProfiler = None,
+    ) -> Interpreter | None:
         """
         Interpret from a file
         """
 
-        with open(path) as f:
-            data = f.read()
+        try:
+            with Lox.__phase("read", timings, memory):
+                with open(path) as f:
+                    data = f.read()
 
-        Lox.__interpret(data)
+            if timings is not None:
+                timings.count("characters", len(data))
+
+            interpreter = Lox.__interpret(
+                data, max_depth, memoize, sampler, host_profiler, stats, timings, memory
+            )
+        finally:
+            if memory is not None:
+                memory.stop()
 
         if Error.had_error:
             exit(1)
+
+        return interpreter
@@ -0,0 +1,193 @@
+"""host profiler module"""
+
+from cProfile import Profile
+from collections import defaultdict
+from os.path import basename
+from pstats import Stats
+from sys import setprofile, stderr
+from threading import setprofile as set_thread_profile
+from typing import Any, Dict, List, TextIO, Tuple
+
+from ..ast import expr
+
+# Lock wait of the thread joining the deep mode thread, its time
+# is already profiled by the deep mode thread
+THREAD_WAIT = "<method 'acquire' of '_thread.lock' objects>"
+
+# Modules whose functions are reported as a whole
+PHASES = {
+    "scanner.py": "scanner",
+    "parser.py": "parser",
+    "resolver.py": "resolver",
+}
+
+
+def node_kinds() -> Tuple[Dict[str, str], Dict[int, str]]:
+    """
+    Return the AST node kind of every visitor method name
+    and of every `accept` method line
+    """
+
+    visitors = {}
+    accepts = {}
+
+    for name, node in vars(expr).items():
+        if not isinstance(node, type):
+            continue
+
+        if issubclass(node, expr.Statement) and node is not expr.Statement:
+            method = "visit_" + name.removesuffix("Statement").lower() + "_statement"
+        elif issubclass(node, expr.Expr) and node is not expr.Expr:
+            method = "visit_" + name.lower() + "_expr"
+        else:
+            continue
+
+        visitors[method] = name
+        accepts[node.accept.__code__.co_firstlineno] = name
+
+    return visitors, accepts
+
+
+VISITORS, ACCEPTS = node_kinds()
+
+EXPR_MODULE = basename(expr.__file__)
+
+
+def group(key: Tuple[str, int, str]) -> str:
+    """
+    Return the group of a profiled function, its AST node kind for
+    a visitor or `accept` method, its phase for the scanner, the parser
+    and the resolver, its module and name otherwise
+    """
+
+    path, line, name = key
+    module = basename(path)
+
+    # Functions implemented in C
+    if path == "~":
+        return name.strip("<>")
+
+    if module == "interpreter.py" and name in VISITORS:
+        return VISITORS[name]
+
+    if module == EXPR_MODULE and name == "accept":
+        return ACCEPTS.get(line, "accept")
+
+    if module in PHASES:
+        return PHASES[module]
+
+    return module.removesuffix(".py") + "." + name
+
+
+class HostProfiler:
+    """
+    Profile of the interpreter itself under `cProfile`, from the
+    scanner to the last statement. The deep mode thread gets a
+    profile of its own, both are merged in the statistics
+    """
+
+    def __init__(self):
+        self.profiles: List[Profile] = []
+
+    def start(self):
+        """
+        Start profiling the current thread and the threads it starts
+        """
+
+        self.__enable()
+
+        set_thread_profile(self.__enable_thread)
+
+    def stop(self):
+        """
+        Stop profiling
+        """
+
+        set_thread_profile(None)
+
+        for profile in self.profiles:
+            profile.disable()
+
+    def __enable(self):
+        """
+        Profile the current thread
+        """
+
+        profile = Profile()
+        self.profiles.append(profile)
+
+        profile.enable()
+
+    def __enable_thread(self, *_: Any):
+        """
+        Profile hook of a started thread, called once to
+        replace itself with a profile of the thread
+        """
+
+        setprofile(None)
+
+        self.__enable()
+
+    def stats(self) -> Stats:
+        """
+        Return the merged statistics of the profiled threads
+        """
+
+        stats = Stats(self.profiles[0])
+
+        for profile in self.profiles[1:]:
+            stats.add(profile)
+
+        return stats
+
+    def dump(self, path: str):
+        """
+        Write the statistics into a `pstats` file
+        """
+
+        self.stats().dump_stats(path)
+
+    def groups(self) -> List[Tuple[str, int, float]]:
+        """
+        Return the calls and the own time of every group,
+        the most expensive first
+        """
+
+        calls = defaultdict(int)
+        times = defaultdict(float)
+
+        for key, (_, ncalls, own, _, _) in self.stats().stats.items():
+            if key[2] == THREAD_WAIT:
+                continue
+
+            name = group(key)
+
+            calls[name] += ncalls
+            times[name] += own
+
+        return sorted(
+            ((name, calls[name], times[name]) for name in times),
+            key=lambda row: -row[2],
+        )
+
+    def report(self, top: int = 10, file: TextIO = stderr):
+        """
+        Write the `top` most expensive groups by own time
+        """
+
+        groups = self.groups()
+        total = sum(own for _, _, own in groups)
+        percent = 100 / (total or 1)
+
+        print(f"{total:.3f} s of profiled own time", file=file)
+        print(
+            f"{'own s':>9} {'own %':>7} {'calls':>10} {'us/call':>9}  group",
+            file=file,
+        )
+
+        for name, calls, own in groups[:top]:
+            print(
+                f"{own:9.3f} {own * percent:7.1f} {calls:10d} "
+                f"{own * 1e6 / max(calls, 1):9.2f}  {name}",
+                file=file,
+            )
@@ -0,0 +1,208 @@
+"""memory profiler module"""
+
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from gc import get_objects
+from os.path import basename
+from sys import stderr
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
+
+# Frames kept by an allocation trace, the caller of a generated
+# `__init__` (a dataclass node) gives its allocation site
+TRACE_FRAMES = 2
+
+# Objects of the classes from this package are counted
+PACKAGE = __name__.split(".")[0]
+
+# Allocation sites kept for every phase
+SITES = 20
+
+# Allocations of the profiler itself
+IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def site(traceback: tracemalloc.Traceback) -> str:
+    """
+    Return the innermost source line of an allocation trace
+    """
+
+    for frame in traceback:
+        if not frame.filename.startswith("<"):
+            return f"{basename(frame.filename)}:{frame.lineno}"
+
+    return f"{traceback[0].filename}:{traceback[0].lineno}"
+
+
+def count_objects() -> Counter[str]:
+    """
+    Return the amount of live objects of every class of this package
+    """
+
+    counts = Counter()
+
+    for value in get_objects():
+        kind = type(value)
+
+        if kind.__module__.partition(".")[0] == PACKAGE:
+            counts[kind.__name__] += 1
+
+    return counts
+
+
+@dataclass
+class MemoryPhase:
+    """
+    Memory used by a phase: the peak traced while it runs,
+    what it leaves allocated, the live objects once it is over
+    and the sites of the memory it leaves allocated
+    """
+
+    name: str
+    peak: int = 0
+    retained: int = 0
+    objects: Counter[str] = field(default_factory=Counter)
+    sites: List[Tuple[str, int, int]] = field(default_factory=list)
+
+
+class MemoryProfiler:
+    """
+    Memory profile of every phase of a run under `tracemalloc`.
+    The tracing starts with the first phase, `stop` ends it
+    """
+
+    def __init__(self):
+        self.phases: List[MemoryPhase] = []
+
+        self.__snapshot = None
+        self.__tracing = False
+
+    def stop(self):
+        """
+        Stop tracing the allocations
+        """
+
+        if self.__tracing:
+            tracemalloc.stop()
+
+        self.__tracing = False
+        self.__snapshot = None
+
+    def __take_snapshot(self) -> tracemalloc.Snapshot:
+        """
+        Return the allocations traced so far, without the profiler ones
+        """
+
+        return tracemalloc.take_snapshot().filter_traces(IGNORED)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[MemoryPhase]:
+        """
+        Profile the phase run within the context
+        """
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+            self.__tracing = True
+            self.__snapshot = self.__take_snapshot()
+
+        phase = MemoryPhase(name)
+        self.phases.append(phase)
+
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        try:
+            yield phase
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+
+            phase.peak = peak
+            phase.retained = current - start
+            phase.objects = count_objects()
+
+            snapshot = self.__take_snapshot()
+            phase.sites = self.__sites(snapshot)
+            self.__snapshot = snapshot
+
+    def __sites(self, snapshot: tracemalloc.Snapshot) -> List[Tuple[str, int, int]]:
+        """
+        Return the sites of the memory allocated since the last
+        snapshot, with its size and its amount of blocks
+        """
+
+        sizes = defaultdict(int)
+        blocks = defaultdict(int)
+
+        for diff in snapshot.compare_to(self.__snapshot, "traceback"):
+            line = site(diff.traceback)
+
+            sizes[line] += diff.size_diff
+            blocks[line] += diff.count_diff
+
+        return sorted(
+            ((line, sizes[line], blocks[line]) for line in sizes),
+            key=lambda row: -row[1],
+        )[:SITES]
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Return the memory profile of every phase, in bytes
+        """
+
+        return {
+            phase.name: {
+                "peak": phase.peak,
+                "retained": phase.retained,
+                "objects": dict(phase.objects.most_common()),
+                "sites": [
+                    {"site": line, "size": size, "blocks": blocks}
+                    for line, size, blocks in phase.sites
+                ],
+            }
+            for phase in self.phases
+        }
+
+    def report(self, top: int = 10, file: TextIO = stderr):
+        """
+        Write the memory of every phase, the `top` most frequent
+        objects and the `top` allocation sites of every phase
+        """
+
+        print(f"{'phase':<10} {'peak KiB':>10} {'retained KiB':>13}", file=file)
+
+        for phase in self.phases:
+            print(
+                f"{phase.name:<10} {phase.peak / 1024:10.1f} "
+                f"{phase.retained / 1024:13.1f}",
+                file=file,
+            )
+
+        # Live objects at the end of every phase, by their last count
+        last = self.phases[-1].objects
+        names = [name for name, _ in last.most_common(top)]
+
+        print(
+            f"\n{'objects':<20}"
+            + "".join(f" {phase.name:>10}" for phase in self.phases),
+            file=file,
+        )
+
+        for name in names:
+            print(
+                f"{name:<20}"
+                + "".join(f" {phase.objects[name]:10d}" for phase in self.phases),
+                file=file,
+            )
+
+        for phase in self.phases:
+            print(f"\nallocated by {phase.name}", file=file)
+            print(f"{'KiB':>10} {'blocks':>10}  site", file=file)
+
+            for line, size, blocks in phase.sites[:top]:
+                print(f"{size / 1024:10.1f} {blocks:10d}  {line}", file=file)
@@ -0,0 +1,209 @@
+"""sampling profiler module"""
+
+from collections import Counter
+from sys import _current_frames, getswitchinterval, setswitchinterval, stderr
+from threading import Event, Thread
+from time import perf_counter
+from types import FrameType
+from typing import Any, List, TextIO, Tuple
+
+from ..ast.interpreter import Interpreter
+
+# Default time between two samples, in seconds
+INTERVAL = 0.001
+
+# Name of the frame running the top-level statements
+SCRIPT = "<script>"
+
+# Node members holding a token, the first one found gives the node line
+TOKEN_MEMBERS = ("name", "operator", "paren", "keyword", "method")
+
+# A sampled frame, its function and the line it runs
+Frame = Tuple[str, int | None]
+
+
+def node_line(node: Any) -> int | None:
+    """
+    Return the source line of an AST node, `None` for
+    the nodes without a token
+    """
+
+    for member in TOKEN_MEMBERS:
+        token = getattr(node, member, None)
+        line = getattr(token, "line", None)
+
+        if line is not None:
+            return line
+
+    return None
+
+
+def running_line(frame: FrameType | None) -> int | None:
+    """
+    Return the line of the innermost node a Python stack is visiting
+    """
+
+    while frame is not None:
+        f_locals = frame.f_locals
+
+        for name in ("expr", "statement"):
+            line = node_line(f_locals.get(name))
+
+            if line is not None:
+                return line
+
+        frame = frame.f_back
+
+    return None
+
+
+class Sampler:
+    """
+    Sampling profiler of the Lox call stack. A thread reads the call
+    stack of the interpreter at a fixed interval, the interpreter
+    runs unchanged so the overhead is only the sampling itself.
+    Every frame is a function with the line it runs, the line of a
+    caller is its call site
+    """
+
+    def __init__(self, interval: float = INTERVAL):
+        self.interval = interval
+
+        # Amount of samples of every stack, from the script frame
+        self.samples: Counter[Tuple[Frame, ...]] = Counter()
+        self.elapsed = 0.0
+
+        self.__interpreter = None
+        self.__thread = None
+        self.__stop = Event()
+        self.__start = 0.0
+        self.__switch_interval = 0.0
+
+    def start(self, interpreter: Interpreter):
+        """
+        Start sampling the stack of `interpreter`
+        """
+
+        self.__interpreter = interpreter
+        self.__stop.clear()
+
+        # The sampling thread needs the GIL once per interval
+        self.__switch_interval = getswitchinterval()
+        setswitchinterval(min(self.__switch_interval, self.interval))
+
+        self.__start = perf_counter()
+
+        self.__thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stop sampling
+        """
+
+        self.__stop.set()
+        self.__thread.join()
+
+        self.elapsed += perf_counter() - self.__start
+
+        setswitchinterval(self.__switch_interval)
+
+    def __run(self):
+        """
+        Sampling thread loop
+        """
+
+        while not self.__stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """
+        Record the current stack of the interpreter
+        """
+
+        interpreter = self.__interpreter
+        thread_id = interpreter.thread_id
+
+        if thread_id is None:
+            return
+
+        calls = list(interpreter.call_stack)
+        frame = _current_frames().get(thread_id)
+
+        if frame is None:
+            return
+
+        # A function runs the line where it called the next one
+        names = [SCRIPT] + [function.declaration.name.lexeme for function, _ in calls]
+        lines = [token.line for _, token in calls] + [running_line(frame)]
+
+        self.samples[tuple(zip(names, lines))] += 1
+
+    def collapsed(self) -> List[str]:
+        """
+        Return the samples in the collapsed stack format read by
+        the flame graph tools, a line per stack with its samples
+        """
+
+        return [
+            ";".join(name if line is None else f"{name}:{line}" for name, line in stack)
+            + f" {count}"
+            for stack, count in self.samples.most_common()
+        ]
+
+    def write_collapsed(self, path: str):
+        """
+        Write the collapsed stacks into a file
+        """
+
+        with open(path, "w") as f:
+            for line in self.collapsed():
+                f.write(line + "\n")
+
+    def table(self) -> List[Tuple[str, int, int]]:
+        """
+        Return the self and total samples of every function,
+        the most expensive by self samples first
+        """
+
+        own = Counter()
+        total = Counter()
+
+        for stack, count in self.samples.items():
+            own[stack[-1][0]] += count
+
+            # A recursive function counts once per sample
+            for name in {name for name, _ in stack}:
+                total[name] += count
+
+        return sorted(
+            ((name, own[name], total[name]) for name in total),
+            key=lambda row: (-row[1], -row[2], row[0]),
+        )
+
+    def report(self, top: int = 10, file: TextIO = stderr):
+        """
+        Write the `top` most expensive functions by self time
+        """
+
+        samples = sum(self.samples.values())
+        # Time a sample stands for
+        period = self.elapsed / max(samples, 1)
+        percent = 100 / max(samples, 1)
+
+        print(
+            f"{samples} samples in {self.elapsed:.3f} s, "
+            f"every {self.interval * 1000:g} ms",
+            file=file,
+        )
+        print(
+            f"{'self %':>8} {'total %':>8} {'self s':>9} {'total s':>9}  function",
+            file=file,
+        )
+
+        for name, own, total in self.table()[:top]:
+            print(
+                f"{own * percent:8.1f} {total * percent:8.1f} "
+                f"{own * period:9.3f} {total * period:9.3f}  {name}",
+                file=file,
+            )
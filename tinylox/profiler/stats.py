@@ -0,0 +1,166 @@
+"""interpreter statistics module"""
+
+from collections import Counter
+from sys import stderr
+from typing import Any, Callable, Dict, List, TextIO
+
+from ..ast.expr import ReturnStatement, Variable
+from ..ast.frame import VariableKind
+from ..ast.function import LoxFunction
+from ..ast.generator import LoxGenerator
+from ..ast.interpreter import Interpreter, RETURN, TAIL_CALL
+from ..error.error import Error
+from ..scanner.token import Token
+from .host import VISITORS
+
+
+class StatsInterpreter(Interpreter):
+    """
+    Interpreter counting what a program does: the nodes evaluated
+    by kind, the frames allocated, the variable reads by kind,
+    the calls of every function, the returns and the runtime errors.
+    It replaces the interpreter only when statistics are asked,
+    so the counters cost nothing otherwise
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+
+        self.nodes: Counter[str] = Counter()
+        self.calls: Counter[str] = Counter()
+        # Variable reads by resolved kind
+        self.lookups: Counter[str] = Counter()
+        # Global reads missing their inline cache, each one looks
+        # the variable up in the global `Environment`
+        self.environment_gets = 0
+        self.returns = 0
+        self.tail_calls = 0
+        self.runtime_errors = 0
+
+        # Layouts of the functions called, they count the frames
+        # they allocate once their pool is empty
+        self.__layouts = set()
+
+    def visit_variable_expr(self, expr: Variable) -> Any:
+        self.nodes["Variable"] += 1
+
+        kind = expr.kind
+        self.lookups[kind.value] += 1
+
+        if kind is VariableKind.GLOBAL and expr.cell is None:
+            self.environment_gets += 1
+
+        return super().visit_variable_expr(expr)
+
+    def visit_return_statement(self, statement: ReturnStatement) -> Any:
+        self.nodes["ReturnStatement"] += 1
+
+        completion = super().visit_return_statement(statement)
+
+        if completion is TAIL_CALL:
+            self.tail_calls += 1
+            self.__enter(self.tail_call[0])
+        elif completion is RETURN:
+            self.returns += 1
+
+        return completion
+
+    def __enter(self, function: LoxFunction):
+        """
+        Count a call of `function`
+        """
+
+        self.calls[function.declaration.name.lexeme] += 1
+        self.__layouts.add(function.layout)
+
+    def call_function(
+        self, function: LoxFunction, frame: List[Any], token: Token
+    ) -> Any:
+        self.__enter(function)
+
+        return super().call_function(function, frame, token)
+
+    def start_generator(
+        self, function: LoxFunction, frame: List[Any], token: Token
+    ) -> LoxGenerator:
+        self.__enter(function)
+
+        return super().start_generator(function, frame, token)
+
+    def interpret(self, statements: List[Any]):
+        had_runtime_error = Error.had_runtime_error
+        Error.had_runtime_error = False
+
+        try:
+            super().interpret(statements)
+        finally:
+            self.runtime_errors += Error.had_runtime_error
+            Error.had_runtime_error |= had_runtime_error
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the counters, the most frequent entries first
+        """
+
+        return {
+            "nodes": dict(self.nodes.most_common()),
+            "frames": sum(layout.allocated for layout in self.__layouts),
+            "lookups": dict(self.lookups.most_common()),
+            "environment_gets": self.environment_gets,
+            "calls": dict(self.calls.most_common()),
+            "returns": self.returns,
+            "tail_calls": self.tail_calls,
+            "runtime_errors": self.runtime_errors,
+            "call_sites": self.call_cache_stats(),
+        }
+
+    def report(self, top: int = 10, file: TextIO = stderr):
+        """
+        Write the counters, with the `top` entries of every table
+        """
+
+        stats = self.stats()
+
+        for title in ("nodes", "lookups", "calls"):
+            table = stats[title]
+
+            print(f"{sum(table.values())} {title}", file=file)
+
+            for name, count in list(table.items())[:top]:
+                print(f"{count:12d}  {name}", file=file)
+
+        for title in (
+            "frames",
+            "environment_gets",
+            "returns",
+            "tail_calls",
+            "runtime_errors",
+        ):
+            print(f"{stats[title]:12d}  {title}", file=file)
+
+        call_sites = dict(stats["call_sites"])
+
+        print(f"{call_sites.pop('sites')} call sites", file=file)
+
+        for title, count in call_sites.items():
+            print(f"{count:12d}  {title}", file=file)
+
+
+def counting(kind: str, visit: Callable[[Interpreter, Any], Any]) -> Callable:
+    """
+    Return a visitor method counting its nodes before visiting them
+    """
+
+    def visit_counted(self: StatsInterpreter, node: Any) -> Any:
+        self.nodes[kind] += 1
+
+        return visit(self, node)
+
+    visit_counted.__name__ = visit.__name__
+
+    return visit_counted
+
+
+for method, kind in VISITORS.items():
+    if hasattr(Interpreter, method) and method not in vars(StatsInterpreter):
+        setattr(StatsInterpreter, method, counting(kind, getattr(Interpreter, method)))
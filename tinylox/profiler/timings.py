@@ -0,0 +1,136 @@
+"""phase timing module"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from sys import stderr
+from time import perf_counter, process_time
+from typing import Any, Dict, Iterator, List, TextIO
+
+from ..ast.expr import Expr, Statement
+
+# Phases run before the first statement
+FRONT_END = ("read", "scan", "parse", "resolve")
+
+
+def count_nodes(statements: List[Statement]) -> int:
+    """
+    Return the amount of AST nodes reachable from statements,
+    a node shared by several parents counts once
+    """
+
+    seen = set()
+    pending = list(statements)
+
+    while pending:
+        node = pending.pop()
+
+        if id(node) in seen:
+            continue
+
+        seen.add(id(node))
+
+        for member in fields(node):
+            value = getattr(node, member.name)
+            children = value if type(value) is list else (value,)
+
+            for child in children:
+                if isinstance(child, (Expr, Statement)):
+                    pending.append(child)
+
+    return len(seen)
+
+
+@dataclass
+class Phase:
+    """
+    Wall and CPU time of a phase, with the amounts it produced
+    """
+
+    name: str
+    wall: float = 0.0
+    cpu: float = 0.0
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+class Timings:
+    """
+    Wall and CPU time of every phase of a run, from reading the
+    script to the last statement. The CPU time is the one of the
+    whole process, so it includes the deep mode thread
+    """
+
+    def __init__(self):
+        self.phases: List[Phase] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Phase]:
+        """
+        Time the phase run within the context
+        """
+
+        phase = Phase(name)
+        self.phases.append(phase)
+
+        wall = perf_counter()
+        cpu = process_time()
+
+        try:
+            yield phase
+        finally:
+            phase.wall = perf_counter() - wall
+            phase.cpu = process_time() - cpu
+
+    def count(self, name: str, amount: int):
+        """
+        Record an amount produced by the last phase
+        """
+
+        self.phases[-1].counts[name] = amount
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Return the timings of every phase, of the front end
+        and of the whole run, in seconds
+        """
+
+        front_end = [phase for phase in self.phases if phase.name in FRONT_END]
+
+        return {
+            "phases": {
+                phase.name: {"wall": phase.wall, "cpu": phase.cpu, **phase.counts}
+                for phase in self.phases
+            },
+            "front_end": {
+                "wall": sum(phase.wall for phase in front_end),
+                "cpu": sum(phase.cpu for phase in front_end),
+            },
+            "total": {
+                "wall": sum(phase.wall for phase in self.phases),
+                "cpu": sum(phase.cpu for phase in self.phases),
+            },
+        }
+
+    def report(self, file: TextIO = stderr):
+        """
+        Write the timings of every phase
+        """
+
+        result = self.result()
+
+        print(f"{'phase':<10} {'wall ms':>10} {'cpu ms':>10}  counts", file=file)
+
+        rows = [
+            (phase.name, phase.wall, phase.cpu, phase.counts) for phase in self.phases
+        ]
+        rows += [
+            (name, result[name]["wall"], result[name]["cpu"], {})
+            for name in ("front_end", "total")
+        ]
+
+        for name, wall, cpu, counts in rows:
+            amounts = ", ".join(f"{amount} {unit}" for unit, amount in counts.items())
+
+            print(
+                f"{name:<10} {wall * 1000:10.3f} {cpu * 1000:10.3f}  {amounts}".rstrip(),
+                file=file,
+            )
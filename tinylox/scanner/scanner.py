@@ -22,6 +22,7 @@ RESERVED_WORDS = {
     "true": TokenKind.TRUE,
     "var": TokenKind.VAR,
     "while": TokenKind.WHILE,
+    "yield": TokenKind.YIELD,
 }
 
 
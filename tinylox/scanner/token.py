@@ -55,6 +55,7 @@ class TokenKind(Enum):
     TRUE = ("true",)
     VAR = ("var",)
     WHILE = ("while",)
+    YIELD = ("yield",)
 
     EOF = "eof"
 
@@ -1,13 +1,127 @@
-from sys import argv
+from argparse import ArgumentParser
 
 from .lox import Lox
+from .profiler.sampler import Sampler, INTERVAL
+from .profiler.host import HostProfiler
+from .profiler.timings import Timings
+from .profiler.memory import MemoryProfiler
 
 
 def main():
-    av = argv[1:]
-    ac = len(av)
+    parser = ArgumentParser(
+        prog="tinylox", description="Tiny Lox Tree-Walk interpreter"
+    )
 
-    if ac != 1:
-        exit(1)
+    parser.add_argument("path", help="Lox script to interpret")
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="run in deep mode, allowing up to MAX_DEPTH nested Lox calls "
+        "(by default the Python recursion limit bounds the calls)",
+    )
 
-    Lox.interpret_from_file(av[0])
+    parser.add_argument(
+        "--memoize",
+        action="store_true",
+        help="cache the results of the functions proven pure",
+    )
+
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="count the nodes evaluated, the frames allocated, the variable "
+        "reads and the calls, and write the counters into stderr",
+    )
+
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="write the wall and CPU time of every phase into stderr",
+    )
+
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="trace the allocations with tracemalloc, write the memory, "
+        "the live objects and the allocation sites of every phase into stderr",
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.folded",
+        metavar="PATH",
+        help="sample the Lox call stack, write the collapsed stacks "
+        "into PATH (default profile.folded) and the hottest functions "
+        "into stderr",
+    )
+
+    parser.add_argument(
+        "--profile-host",
+        nargs="?",
+        const="profile.pstats",
+        metavar="PATH",
+        help="profile the interpreter with cProfile, write the statistics "
+        "into PATH (default profile.pstats) and their sum by AST node kind "
+        "and phase into stderr",
+    )
+
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=INTERVAL * 1000,
+        metavar="MS",
+        help="time between two samples, in milliseconds (default %(default)g)",
+    )
+
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="amount of rows in the profile and statistics tables "
+        "(default %(default)d)",
+    )
+
+    args = parser.parse_args()
+
+    sampler = None
+
+    if args.profile is not None:
+        sampler = Sampler(args.profile_interval / 1000)
+
+    host_profiler = None
+
+    if args.profile_host is not None:
+        host_profiler = HostProfiler()
+
+    timings = Timings() if args.timings else None
+    memory = MemoryProfiler() if args.memory else None
+
+    interpreter = Lox.interpret_from_file(
+        args.path,
+        args.max_depth,
+        args.memoize,
+        sampler,
+        host_profiler,
+        args.stats,
+        timings,
+        memory,
+    )
+
+    if sampler is not None:
+        sampler.write_collapsed(args.profile)
+        sampler.report(args.profile_top)
+
+    if host_profiler is not None:
+        host_profiler.dump(args.profile_host)
+        host_profiler.report(args.profile_top)
+
+    if args.stats and interpreter is not None:
+        interpreter.report(args.profile_top)
+
+    if timings is not None:
+        timings.report()
+
+    if memory is not None:
+        memory.report(args.profile_top)
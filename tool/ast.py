@@ -5,12 +5,16 @@ from io import TextIOWrapper
 from sys import argv
 
 IMPORTS = """from ..scanner.token import Token
-from typing import Any, List
+from typing import Any, Dict, List
 from dataclasses import dataclass
+from .frame import VariableKind, FrameLayout, Cell
 """
 
 EXPR_CLASS_NAME = "Expr"
 
+# Members filled by the resolver
+RESOLVED = "VariableKind kind = VariableKind.GLOBAL, int slot = 0"
+
 CLASS_TEMPLATE = """class %s:
     def accept(self, _: Visitor) -> Any:
         \"\"\"
@@ -22,16 +26,46 @@ CLASS_TEMPLATE = """class %s:
 """
 
 TYPES = (
-    ("Binary", f"{EXPR_CLASS_NAME} left, Token operator, {EXPR_CLASS_NAME} right"),
+    (
+        "Binary",
+        f"{EXPR_CLASS_NAME} left, Token operator, {EXPR_CLASS_NAME} right, "
+        "Any handler = None",
+    ),
     ("Logical", f"{EXPR_CLASS_NAME} left, Token operator, {EXPR_CLASS_NAME} right"),
     ("Grouping", f"{EXPR_CLASS_NAME} expression"),
     ("Literal", "Any value"),
-    ("Assign", "Token name, Expr value"),
-    ("Unary", f"Token operator, {EXPR_CLASS_NAME} right"),
-    ("Variable", "Token name"),
+    ("Assign", f"Token name, Expr value, {RESOLVED}"),
+    ("Unary", f"Token operator, {EXPR_CLASS_NAME} right, Any handler = None"),
+    ("Variable", f"Token name, {RESOLVED}, Cell cell = None"),
     (
         "Call",
-        f"{EXPR_CLASS_NAME} callee, Token paren, List[{EXPR_CLASS_NAME}] arguments",
+        f"{EXPR_CLASS_NAME} callee, Token paren, List[{EXPR_CLASS_NAME}] arguments, "
+        "Dict[Any,Any] cache = None, int hits = 0, int misses = 0",
+    ),
+    # Inline caches keyed on the instance shape, `index` is the field slot
+    (
+        "Get",
+        f"{EXPR_CLASS_NAME} object, Token name, "
+        "Any shape = None, int index = -1, Any method = None",
+    ),
+    (
+        "Set",
+        f"{EXPR_CLASS_NAME} object, Token name, {EXPR_CLASS_NAME} value, "
+        "Any shape = None, int index = -1, Any transition = None",
+    ),
+    # Method call, the method is not bound to the instance,
+    # its cache holds the methods by shape
+    (
+        "Invoke",
+        f"{EXPR_CLASS_NAME} object, Token name, Token paren, "
+        f"List[{EXPR_CLASS_NAME}] arguments, "
+        "Dict[Any,Any] cache = None, int hits = 0, int misses = 0",
+    ),
+    ("This", f"Token keyword, {RESOLVED}"),
+    (
+        "Super",
+        f"Token keyword, Token method, {EXPR_CLASS_NAME} superclass, "
+        f"{EXPR_CLASS_NAME} instance",
     ),
 )
 
@@ -40,17 +74,38 @@ STATEMENT_CLASS_NAME = "Statement"
 STATEMENTS = (
     ("Expression", f"{EXPR_CLASS_NAME} expression"),
     ("Print", f"{EXPR_CLASS_NAME} expression"),
-    ("Return", f"Token keyword, {EXPR_CLASS_NAME} value"),
-    ("Var", f"Token name, {EXPR_CLASS_NAME} initializer"),
-    ("Block", f"List[{STATEMENT_CLASS_NAME}] statements"),
+    ("Return", f"Token keyword, {EXPR_CLASS_NAME} value, bool tail_call = False"),
+    ("Yield", f"Token keyword, {EXPR_CLASS_NAME} value"),
+    ("Var", f"Token name, {EXPR_CLASS_NAME} initializer, {RESOLVED}"),
+    # `yields` is set when a statement holds a `yield` of its function
+    ("Block", f"List[{STATEMENT_CLASS_NAME}] statements, bool yields = False"),
     (
         "If",
-        f"{EXPR_CLASS_NAME} condition, {STATEMENT_CLASS_NAME} then_branch, {STATEMENT_CLASS_NAME} else_branch",
+        f"{EXPR_CLASS_NAME} condition, {STATEMENT_CLASS_NAME} then_branch, {STATEMENT_CLASS_NAME} else_branch, "
+        "bool yields = False",
+    ),
+    (
+        "While",
+        f"{EXPR_CLASS_NAME} condition, {STATEMENT_CLASS_NAME} body, bool yields = False",
     ),
-    ("While", f"{EXPR_CLASS_NAME} condition, {STATEMENT_CLASS_NAME} body"),
     (
         "Function",
-        f"Token name, List[Token] parameters, List[{STATEMENT_CLASS_NAME}] body",
+        f"Token name, List[Token] parameters, List[{STATEMENT_CLASS_NAME}] body, "
+        f"{RESOLVED}, FrameLayout layout = None, bool pure = False, "
+        "bool generator = False",
+    ),
+    (
+        "Class",
+        "Token name, Variable superclass, List[FunctionStatement] methods, "
+        f"{RESOLVED}, VarStatement super_declaration = None",
+    ),
+    # Counting loop, `loop` is its generic form run
+    # unless the resolver proved it `counted`
+    (
+        "For",
+        "VarStatement initializer, Token operator, Expr limit, float step, "
+        f"{STATEMENT_CLASS_NAME} body, BlockStatement loop, "
+        "bool yields = False, bool counted = False",
     ),
 )
 
@@ -101,13 +156,16 @@ def write_dataclass(f: TextIOWrapper, base: str, name: str, members: str):
     writeln(f, '    """')
     writeln(f)
 
-    members = members.split(",")
+    members = members.split(", ")
 
     for member in members:
         member = member.strip()
-        _type, param = member.split(" ")
+        _type, param = member.split(" ", 1)
+        param, *default = param.split(" = ")
 
-        writeln(f, "    " + param + ": " + _type)
+        writeln(
+            f, "    " + param + ": " + " = ".join([_type.replace(",", ", ")] + default)
+        )
 
     name = name.replace(base, "")
 
@@ -0,0 +1,86 @@
+"""benchmark module"""
+
+from typing import List, Dict
+from sys import argv, path
+from os.path import abspath, basename, dirname
+from time import process_time
+from io import StringIO
+from contextlib import redirect_stdout
+from collections import Counter
+
+# Replaces the tool directory, its ast module would shadow the standard one
+path[0] = dirname(dirname(abspath(__file__)))
+
+from tinylox.lox import Lox
+from tinylox.error.error import Error
+from tinylox.ast.environment import Environment
+from tinylox.ast.frame import Cell
+from tinylox.ast.function import LoxFunction
+
+RUNS = 5
+
+# Runtime objects whose allocations are counted
+COUNTED = (Environment, Cell, LoxFunction)
+
+
+def count_allocations(classes: List[type]) -> Counter:
+    """
+    Patch the constructors of `classes` so every allocation is counted
+    """
+
+    allocations = Counter()
+
+    for cls in classes:
+
+        def init(self, *args, __init=cls.__init__, __name=cls.__name__):
+            allocations[__name] += 1
+            __init(self, *args)
+
+        cls.__init__ = init
+
+    return allocations
+
+
+def run(path: str) -> float:
+    """
+    Interpret a Lox file with its output discarded, return the elapsed time
+    """
+
+    Error.error_reset()
+
+    with redirect_stdout(StringIO()):
+        start = process_time()
+        Lox.interpret_from_file(path)
+        elapsed = process_time() - start
+
+    return elapsed
+
+
+def benchmark(path: str, allocations: Counter) -> Dict[str, float]:
+    """
+    Return the best time over `RUNS` runs and the allocations of one run
+    """
+
+    best = min(run(path) for _ in range(RUNS))
+
+    allocations.clear()
+    run(path)
+
+    return {"time": best, **allocations}
+
+
+if __name__ == "__main__":
+    av = argv[1:]
+
+    if not av:
+        exit(1)
+
+    allocations = count_allocations(COUNTED)
+
+    for script in av:
+        result = benchmark(script, allocations)
+        counts = ", ".join(
+            f"{cls.__name__}={result.get(cls.__name__, 0)}" for cls in COUNTED
+        )
+
+        print(f"{basename(script):<24} {result['time']:.3f}s  {counts}")